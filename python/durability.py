@@ -0,0 +1,66 @@
+# coding=utf-8
+import contextlib
+import enum
+import os
+import uuid
+from pathlib import Path
+from typing import Iterator
+
+
+class Durability(enum.Enum):
+    """What is flushed to disk (fsync) before a write is considered done"""
+
+    NONE = "none"
+    FILE = "file"
+    FILE_AND_DIR = "file_and_dir"
+
+
+def fsync(path: Path) -> None:
+    """Flush a file or a directory (e.g. after a rename in it) to disk"""
+
+    # directories can not be opened on Windows, the rename is durable there
+    if path.is_dir() and os.name == "nt":
+        return
+
+    fd: int = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def atomic_target(
+    path: Path,
+    atomic: bool = False,
+    durability: Durability = Durability.NONE,
+) -> Iterator[Path]:
+    """Yield the path to write path's content to
+
+    In atomic mode this is a temporary file in the same directory which
+    replaces path only once the block completes, it is removed on failure.
+    The written file (and the directory for FILE_AND_DIR) is flushed to disk
+    according to durability.
+    """
+
+    write_path: Path = path
+
+    if atomic:
+        write_path = path.parent / f".{path.name}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        yield write_path
+
+        if durability is not Durability.NONE:
+            fsync(write_path)
+
+        if atomic:
+            os.replace(write_path, path)
+
+        if durability is Durability.FILE_AND_DIR:
+            fsync(path.parent)
+    except BaseException:
+        if atomic and write_path.exists():
+            write_path.unlink()
+
+        raise
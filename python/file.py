@@ -2,14 +2,82 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import bisect
 import bz2
+import collections
+import concurrent.futures
+import contextlib
 import copy
+import errno
+import functools
 import gzip
+import io
+import itertools
+import json
 import lzma
+import mmap
+import os
 import shutil
+import time
+import zlib
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Any, Optional, Type, Union
+from dataclasses import dataclass, field, replace
+from typing import (
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
+
+try:
+    from .durability import Durability, atomic_target
+except ImportError:
+    from durability import Durability, atomic_target
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_BLOCK_SIZE: int = 16 * 1024 * 1024
+DEFAULT_BUFFER_SIZE: int = 1024 * 1024
+
+# ioctl request to share the extents of a file (btrfs, xfs, ...) on Linux
+_FICLONE: int = 0x40049409
+# size requested from the kernel per copy_file_range/sendfile call
+_KERNEL_COPY_SIZE: int = 1024 * 1024 * 1024
+# errors meaning the kernel copy is not supported for the pair of files
+_KERNEL_COPY_ERRNOS: frozenset[int] = frozenset(
+    {
+        errno.EBADF,
+        errno.EINVAL,
+        errno.ENOSYS,
+        errno.ENOTSUP,
+        errno.EOPNOTSUPP,
+        errno.EXDEV,
+        errno.ETXTBSY,
+    }
+)
 
 _compressions: dict[str, Type[Compression]] = {}
 
@@ -22,10 +90,12 @@ class Compression(metaclass=abc.ABCMeta):
     def __init__(
         self,
         name: str,
-        extension: Optional[str] = None
+        extension: Optional[str] = None,
+        level: Optional[int] = None,
     ) -> None:
         self._name: str = name
         self._extension: str = extension or f".{name}"
+        self._level: Optional[int] = level
 
     @property
     def name(self) -> str:
@@ -35,75 +105,999 @@ class Compression(metaclass=abc.ABCMeta):
     def extension(self) -> str:
         return self._extension
 
+    @property
+    def level(self) -> Optional[int]:
+        return self._level
+
     @abc.abstractmethod
     def open(self, *args: Any, **kwargs: Any) -> Any:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress data into a single self-contained member"""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress one or more concatenated members"""
+        raise NotImplementedError()
+
+    def decompressor(self) -> Any:
+        """Create an incremental decompressor for a single member
+
+        The returned object has decompress(data), eof and unused_data like
+        the decompressors of the standard library.
+        """
+        raise NotImplementedError()
+
+
+def _get_mode(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+    """Get the mode from open(filename, mode, ...) style arguments"""
+
+    return args[1] if len(args) > 1 else kwargs.get("mode", "rb")
+
+
+def _is_write_mode(mode: str) -> bool:
+    return any(c in mode for c in "wax")
+
 
 class GzipCompression(Compression):
-    def __init__(self, extension: Optional[str] = ".gz") -> None:
-        super().__init__("gzip", extension)
+    def __init__(
+        self,
+        extension: Optional[str] = ".gz",
+        level: Optional[int] = None,
+    ) -> None:
+        super().__init__("gzip", extension, level)
 
     def open(self, *args: Any, **kwargs: Any) -> Any:
+        if self._level is not None and _is_write_mode(_get_mode(args, kwargs)):
+            kwargs.setdefault("compresslevel", self._level)
+
         return gzip.open(*args, **kwargs)
 
+    def compress(self, data: bytes) -> bytes:
+        if self._level is None:
+            return gzip.compress(data)
+
+        return gzip.compress(data, compresslevel=self._level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return gzip.decompress(data)
+
+    def decompressor(self) -> Any:
+        return zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+
 
 _compressions["gzip"] = GzipCompression
 
 
 class Bzip2Compression(Compression):
-    def __init__(self, extension: Optional[str] = ".bz2") -> None:
-        super().__init__("bzip2", extension)
+    def __init__(
+        self,
+        extension: Optional[str] = ".bz2",
+        level: Optional[int] = None,
+    ) -> None:
+        super().__init__("bzip2", extension, level)
 
     def open(self, *args: Any, **kwargs: Any) -> Any:
+        if self._level is not None and _is_write_mode(_get_mode(args, kwargs)):
+            kwargs.setdefault("compresslevel", self._level)
+
         return bz2.open(*args, **kwargs)
 
+    def compress(self, data: bytes) -> bytes:
+        if self._level is None:
+            return bz2.compress(data)
+
+        return bz2.compress(data, compresslevel=self._level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return bz2.decompress(data)
+
+    def decompressor(self) -> Any:
+        return bz2.BZ2Decompressor()
+
 
 _compressions["bzip2"] = Bzip2Compression
 
 
 class LzmaCompression(Compression):
-    def __init__(self, extension: Optional[str] = ".xz") -> None:
-        super().__init__("lzma", extension)
+    def __init__(
+        self,
+        extension: Optional[str] = ".xz",
+        level: Optional[int] = None,
+    ) -> None:
+        super().__init__("lzma", extension, level)
 
     def open(self, *args: Any, **kwargs: Any) -> Any:
+        if self._level is not None and _is_write_mode(_get_mode(args, kwargs)):
+            kwargs.setdefault("preset", self._level)
+
         return lzma.open(*args, **kwargs)
 
+    def compress(self, data: bytes) -> bytes:
+        return lzma.compress(data, preset=self._level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lzma.decompress(data)
+
+    def decompressor(self) -> Any:
+        return lzma.LZMADecompressor()
+
 
 _compressions["lzma"] = LzmaCompression
 
 
+class ZstdCompression(Compression):
+    """Zstandard, requires the optional zstandard package
+
+    Contexts are created per call, they are not thread-safe and not picklable,
+    this way one instance can be shared by the parallel (block) modes.
+    """
+
+    def __init__(
+        self,
+        extension: Optional[str] = ".zst",
+        level: Optional[int] = None,
+        dictionary: Optional[bytes] = None,
+        threads: int = 0,
+    ) -> None:
+        if zstandard is None:
+            raise ImportError("ZstdCompression requires the zstandard package")
+
+        super().__init__("zstd", extension, level)
+
+        self._dictionary: Optional[bytes] = dictionary
+        self._threads: int = threads
+
+    @staticmethod
+    def train_dictionary(samples: list[bytes], size: int = 112_640) -> bytes:
+        """Train a dictionary on sample records, useful for small records"""
+
+        if zstandard is None:
+            raise ImportError("ZstdCompression requires the zstandard package")
+
+        return zstandard.train_dictionary(size, samples).as_bytes()
+
+    def _dict_data(self) -> Optional[zstandard.ZstdCompressionDict]:
+        if self._dictionary is None:
+            return None
+
+        return zstandard.ZstdCompressionDict(self._dictionary)
+
+    def _compressor(self) -> zstandard.ZstdCompressor:
+        return zstandard.ZstdCompressor(
+            level=3 if self._level is None else self._level,
+            dict_data=self._dict_data(),
+            threads=self._threads,
+        )
+
+    def _decompressor(self) -> zstandard.ZstdDecompressor:
+        return zstandard.ZstdDecompressor(dict_data=self._dict_data())
+
+    def open(self, *args: Any, **kwargs: Any) -> Any:
+        if _is_write_mode(_get_mode(args, kwargs)):
+            kwargs.setdefault("cctx", self._compressor())
+        else:
+            kwargs.setdefault("dctx", self._decompressor())
+
+        return zstandard.open(*args, **kwargs)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor().compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        with self._decompressor().stream_reader(
+            io.BytesIO(data),
+            read_across_frames=True,
+        ) as reader:
+            return reader.read()
+
+    def decompressor(self) -> Any:
+        return self._decompressor().decompressobj()
+
+
+_compressions["zstd"] = ZstdCompression
+
+
+class Lz4Compression(Compression):
+    """LZ4 frame format, requires the optional lz4 package
+
+    The lz4 frame bindings have no dictionary support and encode on a single
+    thread, use the parallel (block) mode of File.compress for more threads.
+    """
+
+    def __init__(
+        self,
+        extension: Optional[str] = ".lz4",
+        level: Optional[int] = None,
+    ) -> None:
+        if lz4 is None:
+            raise ImportError("Lz4Compression requires the lz4 package")
+
+        super().__init__("lz4", extension, level)
+
+    def open(self, *args: Any, **kwargs: Any) -> Any:
+        if self._level is not None and _is_write_mode(_get_mode(args, kwargs)):
+            kwargs.setdefault("compression_level", self._level)
+
+        return lz4.frame.open(*args, **kwargs)
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4.frame.compress(data, compression_level=self._level or 0)
+
+    def decompress(self, data: bytes) -> bytes:
+        blocks: list[bytes] = []
+
+        while data:
+            decompressor = lz4.frame.LZ4FrameDecompressor()
+            blocks.append(decompressor.decompress(data))
+            data = decompressor.unused_data
+
+        return b"".join(blocks)
+
+    def decompressor(self) -> Any:
+        return lz4.frame.LZ4FrameDecompressor()
+
+
+_compressions["lz4"] = Lz4Compression
+
+
+def _map_ordered(
+    executor: concurrent.futures.Executor,
+    function: Callable[[T], R],
+    items: Iterable[T],
+    window: int,
+) -> Iterator[R]:
+    """Map items in parallel, keep at most window tasks in flight, keep order"""
+
+    pending: collections.deque[concurrent.futures.Future] = collections.deque()
+
+    for item in items:
+        pending.append(executor.submit(function, item))
+
+        if len(pending) >= window:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def _iter_blocks(file: BinaryIO, sizes: Iterable[int]) -> Iterator[bytes]:
+    for size in sizes:
+        block: bytes = file.read(size)
+
+        if not block:
+            return
+
+        yield block
+
+
+def _create_executor(
+    workers: Optional[int],
+    use_processes: bool,
+) -> concurrent.futures.Executor:
+    if use_processes:
+        return concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+
+    # zlib, bz2 and lzma release the GIL while (de)compressing
+    return concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+
+def _reflink(in_fd: int, out_fd: int) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(out_fd, _FICLONE, in_fd)
+    except OSError as e:
+        if e.errno in _KERNEL_COPY_ERRNOS or e.errno == errno.ENOTTY:
+            return False
+
+        raise e
+
+    return True
+
+
+def _kernel_copy(
+    copy_function: Optional[Callable[[int, int], int]],
+    in_fd: int,
+    out_fd: int,
+) -> bool:
+    """Copy from the current positions until EOF, False if not supported"""
+
+    if copy_function is None:
+        return False
+
+    copied: int = 0
+
+    while True:
+        try:
+            n: int = copy_function(in_fd, out_fd)
+        except OSError as e:
+            # only safe to fall back if nothing was copied yet
+            if copied == 0 and e.errno in _KERNEL_COPY_ERRNOS:
+                return False
+
+            raise e
+
+        if n == 0:
+            # some special files report 0 even if they have content
+            return copied > 0 or os.fstat(in_fd).st_size == 0
+
+        copied += n
+
+
+def _copy_file_range(in_fd: int, out_fd: int) -> int:
+    return os.copy_file_range(in_fd, out_fd, _KERNEL_COPY_SIZE)
+
+
+def _sendfile(in_fd: int, out_fd: int) -> int:
+    return os.sendfile(out_fd, in_fd, None, _KERNEL_COPY_SIZE)
+
+
+def _copy_plain(source: BinaryIO, target: BinaryIO, buffer_size: int) -> None:
+    """Copy between plain files, kernel-side if possible
+
+    Tries reflink, copy_file_range and sendfile in this order, falls back to a
+    buffered loop if none of them is available for the pair of files.
+    """
+
+    try:
+        in_fd: int = source.fileno()
+        out_fd: int = target.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        shutil.copyfileobj(source, target, buffer_size)
+        return
+
+    target.flush()
+
+    if (
+        _reflink(in_fd, out_fd) or
+        _kernel_copy(
+            _copy_file_range if hasattr(os, "copy_file_range") else None,
+            in_fd,
+            out_fd,
+        ) or
+        _kernel_copy(
+            _sendfile if hasattr(os, "sendfile") else None,
+            in_fd,
+            out_fd,
+        )
+    ):
+        return
+
+    shutil.copyfileobj(source, target, buffer_size)
+
+
+@contextlib.contextmanager
+def _target_guard(
+    path: Path,
+    overwrite: bool,
+    atomic: bool = False,
+    durability: Durability = Durability.NONE,
+) -> Iterator[Path]:
+    """Refuse to overwrite path and remove partial output on failure
+
+    Yields the path to write to, in atomic mode a temporary file in the same
+    directory which replaces path only once it is completely written.
+    """
+
+    if path.exists() and not overwrite:
+        raise FileExistsError(
+            f"The target {path} already exists, operation aborted!"
+        )
+
+    try:
+        with atomic_target(path, atomic, durability) as write_path:
+            yield write_path
+    except Exception as e:
+        # partial output written in place
+        if not atomic and path.exists():
+            path.unlink()
+
+        raise e
+
+
+@dataclass
+class CompressedIndex(object):
+    """Uncompressed to compressed offsets of the members of a file
+
+    checkpoints holds (compressed offset, uncompressed offset) of the start of
+    every member and of the end of the file. Members are independent, so
+    reading at any offset decompresses at most one member. Seeking is only as
+    fine-grained as the members: a read decompresses its member from the
+    start up to the offset, in bounded chunks. Random access is only cheap for
+    files written by the parallel (block) mode of File.compress, which have
+    one member per block; files of standard tools have a single member.
+
+    The last checkpoint is the compressed size of the file, together with
+    mtime_ns it identifies the version of the file the index describes.
+    """
+
+    checkpoints: list[tuple[int, int]]
+    mtime_ns: Optional[int] = None
+
+    @property
+    def size(self) -> int:
+        """Uncompressed size"""
+        return self.checkpoints[-1][1]
+
+    def matches(self, path: Path) -> bool:
+        """Whether the index describes the current version of the file"""
+
+        try:
+            stat: os.stat_result = path.stat()
+        except FileNotFoundError:
+            return False
+
+        return (
+            self.mtime_ns == stat.st_mtime_ns and
+            self.checkpoints[-1][0] == stat.st_size
+        )
+
+    @classmethod
+    def from_sizes(
+        cls,
+        compressed: Iterable[int],
+        uncompressed: Iterable[int],
+        mtime_ns: Optional[int] = None,
+    ) -> CompressedIndex:
+        checkpoints: list[tuple[int, int]] = [(0, 0)]
+
+        for c, u in zip(compressed, uncompressed):
+            c_offset, u_offset = checkpoints[-1]
+            checkpoints.append((c_offset + c, u_offset + u))
+
+        return cls(checkpoints=checkpoints, mtime_ns=mtime_ns)
+
+    @classmethod
+    def scan(
+        cls,
+        path: Path,
+        compression: Compression,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> CompressedIndex:
+        """Build the index by decompressing the whole file once"""
+
+        checkpoints: list[tuple[int, int]] = [(0, 0)]
+        decompressor: Any = compression.decompressor()
+        c_offset: int = 0
+        u_offset: int = 0
+
+        with open(path, 'rb') as file:
+            mtime_ns: int = os.fstat(file.fileno()).st_mtime_ns
+
+            for chunk in iter(lambda: file.read(buffer_size), b""):
+                while chunk:
+                    u_offset += len(decompressor.decompress(chunk))
+
+                    if not decompressor.eof:
+                        c_offset += len(chunk)
+                        break
+
+                    # lz4 reports None instead of empty bytes
+                    unused: bytes = decompressor.unused_data or b""
+                    c_offset += len(chunk) - len(unused)
+                    checkpoints.append((c_offset, u_offset))
+
+                    decompressor = compression.decompressor()
+                    chunk = unused
+
+        if checkpoints[-1][0] != c_offset:
+            raise EOFError(f"The file {path} ends in an incomplete member")
+
+        return cls(checkpoints=checkpoints, mtime_ns=mtime_ns)
+
+    @classmethod
+    def read(cls, path: Path) -> CompressedIndex:
+        data: dict[str, Any] = json.loads(path.read_text())
+
+        return cls(
+            checkpoints=[(c, u) for c, u in data["checkpoints"]],
+            mtime_ns=data.get("mtime_ns"),
+        )
+
+    def write(self, path: Path) -> None:
+        # a partially written index is never left behind
+        with atomic_target(path, atomic=True) as write_path:
+            write_path.write_text(
+                json.dumps(
+                    {"checkpoints": self.checkpoints, "mtime_ns": self.mtime_ns}
+                )
+            )
+
+
+class _FileRange(io.RawIOBase):
+    """Read-only view of the bytes from start to end of an opened file"""
+
+    def __init__(self, file: BinaryIO, start: int, end: int) -> None:
+        super().__init__()
+
+        self._file: BinaryIO = file
+        self._position: int = start
+        self._end: int = end
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        size: int = min(len(buffer), self._end - self._position)
+
+        if size <= 0:
+            return 0
+
+        self._file.seek(self._position)
+        n: int = self._file.readinto(memoryview(buffer)[:size])
+        self._position += n
+
+        return n
+
+
+class _IndexedReader(io.RawIOBase):
+    """Seekable reader of a compressed file, decompresses one member at once
+
+    The member is decompressed as a stream by the reader of the compression,
+    memory stays bounded however large the member is. Reading forward
+    continues the stream, seeking backwards within the member restarts it
+    from the start of the member.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        compression: Compression,
+        index: CompressedIndex,
+    ) -> None:
+        super().__init__()
+
+        self._file: BinaryIO = open(path, 'rb')
+        self._compression: Compression = compression
+        self._index: CompressedIndex = index
+        self._offsets: list[int] = [u for _, u in index.checkpoints]
+        self._position: int = 0
+        self._member: int = -1
+        self._stream: Optional[BinaryIO] = None
+        # uncompressed offset of the next read of the stream
+        self._stream_position: int = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._index.size
+
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+
+        self._position = offset
+
+        return self._position
+
+    def _start_member(self, member: int) -> None:
+        start, self._stream_position = self._index.checkpoints[member]
+        end, _ = self._index.checkpoints[member + 1]
+
+        if self._stream is not None:
+            self._stream.close()
+
+        self._stream = self._compression.open(
+            _FileRange(self._file, start, end), 'rb'
+        )
+        self._member = member
+
+    def _read_stream(self, size: int) -> bytes:
+        data: bytes = self._stream.read(size)
+
+        if not data:
+            raise EOFError(f"The member {self._member} is shorter than indexed")
+
+        self._stream_position += len(data)
+
+        return data
+
+    def readinto(self, buffer: Any) -> int:
+        if self._position >= self._index.size:
+            return 0
+
+        member: int = bisect.bisect_right(self._offsets, self._position) - 1
+
+        if member != self._member or self._position < self._stream_position:
+            self._start_member(member)
+
+        while self._stream_position < self._position:
+            self._read_stream(
+                min(DEFAULT_BUFFER_SIZE, self._position - self._stream_position)
+            )
+
+        end: int = self._offsets[member + 1]
+        data: bytes = self._read_stream(min(len(buffer), end - self._position))
+        buffer[:len(data)] = data
+        self._position += len(data)
+
+        return len(data)
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+
+        self._file.close()
+        super().close()
+
+
+_async_executor: Optional[concurrent.futures.Executor] = None
+
+
+def set_async_executor(executor: concurrent.futures.Executor) -> None:
+    """Set the executor running the blocking work of the async File API"""
+
+    global _async_executor
+    _async_executor = executor
+
+
+def get_async_executor() -> concurrent.futures.Executor:
+    global _async_executor
+
+    if _async_executor is None:
+        _async_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            thread_name_prefix="file-io",
+        )
+
+    return _async_executor
+
+
+class AsyncFile(object):
+    """Async wrapper of an opened (possibly compressed) file
+
+    Every call runs in the executor, one at a time per file. Chunks are only
+    read when the consumer asks for them, a slow consumer slows the reads.
+    """
+
+    def __init__(
+        self,
+        file: Any,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> None:
+        self._file: Any = file
+        self._executor: concurrent.futures.Executor = (
+            executor or get_async_executor()
+        )
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    async def _run(self, function: Callable[..., R], *args: Any) -> R:
+        async with self._lock:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, function, *args
+            )
+
+    async def read(self, size: int = -1) -> Union[str, bytes]:
+        return await self._run(self._file.read, size)
+
+    async def readline(self) -> Union[str, bytes]:
+        return await self._run(self._file.readline)
+
+    async def write(self, data: Union[str, bytes]) -> int:
+        return await self._run(self._file.write, data)
+
+    async def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return await self._run(self._file.seek, offset, whence)
+
+    async def flush(self) -> None:
+        await self._run(self._file.flush)
+
+    async def close(self) -> None:
+        await self._run(self._file.close)
+
+    async def iter_chunks(
+        self,
+        size: int = DEFAULT_BUFFER_SIZE,
+    ) -> AsyncIterator[Union[str, bytes]]:
+        while True:
+            chunk: Union[str, bytes] = await self.read(size)
+
+            if not chunk:
+                return
+
+            yield chunk
+
+    def __aiter__(self) -> AsyncIterator[Union[str, bytes]]:
+        return self.iter_chunks()
+
+    async def __aenter__(self) -> AsyncFile:
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.close()
+
+
 @dataclass
 class File(object):
     path: Path
-    encoding: str = "utf-8",
-    is_binary: bool = False,
+    encoding: str = "utf-8"
+    is_binary: bool = False
     compression: Optional[Compression] = None
+    # compressed size of each member, known if written by a parallel compress
+    members: Optional[list[int]] = None
+    # random-access index of a compressed file, see load_index
+    index: Optional[CompressedIndex] = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.parent / f"{self.path.name}.idx"
 
     def open(self, *args: Any, **kwargs: Any) -> Any:
         if self.compression is not None:
+            # only a plain binary read can be served by the index
+            if (
+                self.index is not None and
+                len(args) <= 1 and
+                set(kwargs) <= {"mode"} and
+                sorted(_get_mode((self.path, *args), kwargs)) == ["b", "r"]
+            ):
+                return io.BufferedReader(
+                    _IndexedReader(self.path, self.compression, self.index)
+                )
+
             return self.compression.open(self.path, *args, **kwargs)
         else:
             return open(self.path, *args, **kwargs)
 
+    def load_index(self, build: bool = True) -> Optional[CompressedIndex]:
+        """Load the sidecar index, scan the file and write it if missing
+
+        An index not matching the size and mtime of the file, e.g. one left
+        over from an earlier version of it, is rebuilt as well (or dropped if
+        build is not set). If the sidecar can not be written (e.g. read-only
+        location) the built index is only kept in memory.
+        """
+
+        if self.compression is None:
+            return None
+
+        self.index = None
+
+        if self.index_path.exists():
+            index: CompressedIndex = CompressedIndex.read(self.index_path)
+
+            if index.matches(self.path):
+                self.index = index
+
+        if self.index is None and build:
+            self.index = CompressedIndex.scan(self.path, self.compression)
+
+            try:
+                self.index.write(self.index_path)
+            except OSError:
+                pass
+
+        return self.index
+
+    async def aopen(
+        self,
+        *args: Any,
+        executor: Optional[concurrent.futures.Executor] = None,
+        **kwargs: Any,
+    ) -> AsyncFile:
+        """Open the file without blocking the event loop, see open"""
+
+        executor = executor or get_async_executor()
+        file: Any = await asyncio.get_running_loop().run_in_executor(
+            executor, functools.partial(self.open, *args, **kwargs)
+        )
+
+        return AsyncFile(file=file, executor=executor)
+
+    async def acompress(
+        self,
+        *args: Any,
+        executor: Optional[concurrent.futures.Executor] = None,
+        **kwargs: Any,
+    ) -> File:
+        """Compress in the executor, see compress"""
+
+        return await asyncio.get_running_loop().run_in_executor(
+            executor or get_async_executor(),
+            functools.partial(self.compress, *args, **kwargs),
+        )
+
+    async def auncompress(
+        self,
+        *args: Any,
+        executor: Optional[concurrent.futures.Executor] = None,
+        **kwargs: Any,
+    ) -> File:
+        """Uncompress in the executor, see uncompress"""
+
+        return await asyncio.get_running_loop().run_in_executor(
+            executor or get_async_executor(),
+            functools.partial(self.uncompress, *args, **kwargs),
+        )
+
+    def read_range(self, offset: int, size: int) -> bytes:
+        """Read size bytes of the (uncompressed) content from offset
+
+        Only the member containing offset is decompressed, see CompressedIndex.
+        """
+
+        if self.index is None or not self.index.matches(self.path):
+            self.load_index()
+
+        with self.open('rb') as file:
+            file.seek(offset)
+            return file.read(size)
+
+    def iter_chunks(self, size: int = DEFAULT_BUFFER_SIZE) -> Iterator[bytes]:
+        """Iterate over the (uncompressed) content in chunks of size bytes"""
+
+        with self.open('rb') as file:
+            while True:
+                chunk: bytes = file.read(size)
+
+                if not chunk:
+                    return
+
+                yield chunk
+
+    def iter_lines(
+        self,
+        keep_ends: bool = False,
+    ) -> Iterator[Union[str, bytes]]:
+        """Iterate over the (uncompressed) lines, bytes if is_binary is set"""
+
+        if self.is_binary:
+            file = self.open('rb')
+
+            # e.g. the zstandard reader does not support readline
+            if not isinstance(file, io.BufferedIOBase):
+                file = io.BufferedReader(file)
+
+            newline: Union[str, bytes] = b"\n"
+        else:
+            file = self.open('rt', encoding=self.encoding)
+            newline: Union[str, bytes] = "\n"
+
+        with file:
+            for line in file:
+                if not keep_ends and line.endswith(newline):
+                    line = line[:-1]
+
+                yield line
+
+    def mmap(self) -> memoryview:
+        """Map the content into memory read-only, only for uncompressed files
+
+        The returned view is zero-copy, the mapping is released when the view
+        (and every slice of it) is released.
+        """
+
+        if self.compression is not None:
+            raise ValueError(
+                f"Cannot map compressed file {self.path}, use iter_chunks"
+            )
+
+        with open(self.path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # zero length mappings are not allowed
+                return memoryview(b"")
+
+            return memoryview(
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            )
+
     def copy_content_binary(
         self,
         target: File,
         overwrite: bool = False,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        atomic: bool = False,
+        durability: Durability = Durability.NONE,
     ) -> None:
-        if target.path.exists() and not overwrite:
-            raise FileExistsError(
-                f"The target {target.path} already exists, operation aborted!"
-            )
-        try:
+        """Copy the content, (un)compressing it as needed
+
+        In atomic mode the content is written to a temporary file next to the
+        target and renamed, readers never see a partially written target.
+        """
+
+        with _target_guard(
+            path=target.path,
+            overwrite=overwrite,
+            atomic=atomic,
+            durability=durability,
+        ) as path:
             with self.open('rb') as source_file:
-                with target.open('wb') as target_file:
-                    shutil.copyfileobj(source_file, target_file)
-        except Exception as e:
-            if target.path.exists():
-                target.path.unlink()
+                with replace(target, path=path).open('wb') as target_file:
+                    if self.compression is None and target.compression is None:
+                        _copy_plain(source_file, target_file, buffer_size)
+                    else:
+                        shutil.copyfileobj(source_file, target_file, buffer_size)
 
-            raise e
+    def _compress_parallel(
+        self,
+        target: File,
+        overwrite: bool,
+        block_size: int,
+        workers: Optional[int],
+        use_processes: bool,
+        atomic: bool,
+        durability: Durability,
+    ) -> tuple[list[int], list[int]]:
+        """Compress independent blocks into a multi-member file
+
+        Returns the compressed and the uncompressed size of every member.
+        """
+
+        members: list[int] = []
+        sizes: list[int] = []
+
+        def read_blocks(file: BinaryIO) -> Iterator[bytes]:
+            for block in _iter_blocks(file, itertools.repeat(block_size)):
+                sizes.append(len(block))
+                yield block
+
+        with _target_guard(
+            path=target.path,
+            overwrite=overwrite,
+            atomic=atomic,
+            durability=durability,
+        ) as path:
+            with self.open('rb') as source_file:
+                with open(path, 'wb') as target_file:
+                    with _create_executor(workers, use_processes) as executor:
+                        for member in _map_ordered(
+                            executor=executor,
+                            function=target.compression.compress,
+                            items=read_blocks(source_file),
+                            window=2 * (workers or os.cpu_count() or 1),
+                        ):
+                            target_file.write(member)
+                            members.append(len(member))
+
+                    # an empty file is not a valid bzip2/xz stream
+                    if not members:
+                        member = target.compression.compress(b"")
+                        target_file.write(member)
+                        members.append(len(member))
+                        sizes.append(0)
+
+        return members, sizes
+
+    def _uncompress_parallel(
+        self,
+        target: File,
+        overwrite: bool,
+        workers: Optional[int],
+        use_processes: bool,
+        atomic: bool,
+        durability: Durability,
+    ) -> None:
+        """Decompress the known members of a multi-member file in parallel"""
+
+        with _target_guard(
+            path=target.path,
+            overwrite=overwrite,
+            atomic=atomic,
+            durability=durability,
+        ) as path:
+            with open(self.path, 'rb') as source_file:
+                with replace(target, path=path).open('wb') as target_file:
+                    with _create_executor(workers, use_processes) as executor:
+                        for block in _map_ordered(
+                            executor=executor,
+                            function=self.compression.decompress,
+                            items=_iter_blocks(source_file, self.members),
+                            window=2 * (workers or os.cpu_count() or 1),
+                        ):
+                            target_file.write(block)
 
     def compress(
             self,
@@ -111,9 +1105,25 @@ class File(object):
             target_path: Optional[Path] = None,
             overwrite: bool = False,
             delete_source: bool = False,
+            block_size: Optional[int] = None,
+            workers: Optional[int] = None,
+            use_processes: bool = False,
+            index: bool = False,
+            atomic: bool = False,
+            durability: Durability = Durability.NONE,
     ) -> File:
+        """Compress the file, in parallel blocks if block_size or workers set
+
+        Parallel mode writes every block as an independent member, the result
+        is a valid multi-member gzip/bzip2/xz file readable by standard tools.
+        The member sizes are kept on the returned File so uncompress can
+        decompress them in parallel as well. If index is set a sidecar
+        random-access index is written as well, this implies block mode.
+        See copy_content_binary for atomic and durability.
+        """
+
         if isinstance(compression, str):
-            compression = create_compression(name=compression)
+            compression = create_compression(name=compression)()
 
         target: File = copy.deepcopy(self)
         target.compression = compression
@@ -124,7 +1134,38 @@ class File(object):
         else:
             target.path = target_path
 
-        self.copy_content_binary(target=target, overwrite=overwrite)
+        target.members = None
+        target.index = None
+
+        if block_size is None and workers is None and not index:
+            self.copy_content_binary(
+                target=target,
+                overwrite=overwrite,
+                atomic=atomic,
+                durability=durability,
+            )
+        else:
+            target.members, sizes = self._compress_parallel(
+                target=target,
+                overwrite=overwrite,
+                block_size=block_size or DEFAULT_BLOCK_SIZE,
+                workers=workers,
+                use_processes=use_processes,
+                atomic=atomic,
+                durability=durability,
+            )
+
+            if index:
+                target.index = CompressedIndex.from_sizes(
+                    target.members,
+                    sizes,
+                    mtime_ns=target.path.stat().st_mtime_ns,
+                )
+                target.index.write(target.index_path)
+
+        # an index of a previous version of the target would be stale
+        if target.index is None and target.index_path.exists():
+            target.index_path.unlink()
 
         if delete_source:
             self.path.unlink()
@@ -136,19 +1177,211 @@ class File(object):
         target_path: Optional[Path] = None,
         overwrite: bool = False,
         delete_source: bool = False,
+        workers: Optional[int] = None,
+        use_processes: bool = False,
+        atomic: bool = False,
+        durability: Durability = Durability.NONE,
     ) -> File:
+        """Uncompress the file, in parallel if the member sizes are known"""
+
         target: File = copy.deepcopy(self)
         target.compression = None
+        target.members = None
+        target.index = None
 
         if target_path is None:
-            name: str = self.path.name.lstrip(self.compression.extension)
+            name: str = self.path.name.removesuffix(self.compression.extension)
             target.path = self.path.parent / name
         else:
             target.path = target_path
 
-        self.copy_content_binary(target=target, overwrite=overwrite)
+        if self.members is None:
+            self.copy_content_binary(
+                target=target,
+                overwrite=overwrite,
+                atomic=atomic,
+                durability=durability,
+            )
+        else:
+            self._uncompress_parallel(
+                target=target,
+                overwrite=overwrite,
+                workers=workers,
+                use_processes=use_processes,
+                atomic=atomic,
+                durability=durability,
+            )
 
         if delete_source:
             self.path.unlink()
 
+            if self.index_path.exists():
+                self.index_path.unlink()
+
         return target
+
+
+@dataclass
+class BatchResult(object):
+    source: File
+    target: Optional[File] = None
+    error: Optional[BaseException] = None
+    # bytes read from the source
+    size: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second"""
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class BatchReport(object):
+    results: list[BatchResult] = field(default_factory=list)
+    # wall time of the whole batch
+    seconds: float = 0.0
+
+    @property
+    def size(self) -> int:
+        return sum(r.size for r in self.results)
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second (wall time)"""
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def failed(self) -> list[BatchResult]:
+        return [r for r in self.results if not r.ok]
+
+
+def _run_one(
+    source: File,
+    method: str,
+    target_dir: Optional[Path],
+    kwargs: dict[str, Any],
+) -> BatchResult:
+    result: BatchResult = BatchResult(source=source)
+    start: float = time.perf_counter()
+
+    try:
+        result.size = source.path.stat().st_size
+
+        if target_dir is not None:
+            name: str = source.path.name
+
+            if method == "compress":
+                name = f"{name}{kwargs['compression'].extension}"
+            else:
+                name = name.removesuffix(source.compression.extension)
+
+            kwargs = {**kwargs, "target_path": target_dir / name}
+
+        result.target = getattr(source, method)(**kwargs)
+    except Exception as e:
+        # every target is cleaned up by its own compress/uncompress
+        result.error = e
+
+    result.seconds = time.perf_counter() - start
+
+    return result
+
+
+def _run_many(
+    files: Iterable[File],
+    method: str,
+    target_dir: Optional[Path],
+    workers: Optional[int],
+    use_processes: bool,
+    kwargs: dict[str, Any],
+) -> BatchReport:
+    report: BatchReport = BatchReport()
+    start: float = time.perf_counter()
+    files = list(files)
+
+    with _create_executor(workers, use_processes) as executor:
+        report.results = list(
+            _map_ordered(
+                executor=executor,
+                function=functools.partial(
+                    _run_one,
+                    method=method,
+                    target_dir=target_dir,
+                    kwargs=kwargs,
+                ),
+                items=files,
+                window=len(files) or 1,
+            )
+        )
+
+    report.seconds = time.perf_counter() - start
+
+    return report
+
+
+def compress_many(
+    files: Iterable[File],
+    compression: Union[str, Compression] = GzipCompression(),
+    workers: Optional[int] = None,
+    target_dir: Optional[Path] = None,
+    overwrite: bool = False,
+    delete_source: bool = False,
+    use_processes: bool = True,
+    **kwargs: Any,
+) -> BatchReport:
+    """Compress many files in a worker pool, one file per task
+
+    Failures do not stop the batch, they are reported per file. Additional
+    keyword arguments are passed to File.compress.
+    """
+
+    if isinstance(compression, str):
+        compression = create_compression(name=compression)()
+
+    return _run_many(
+        files=files,
+        method="compress",
+        target_dir=target_dir,
+        workers=workers,
+        use_processes=use_processes,
+        kwargs={
+            **kwargs,
+            "compression": compression,
+            "overwrite": overwrite,
+            "delete_source": delete_source,
+        },
+    )
+
+
+def uncompress_many(
+    files: Iterable[File],
+    workers: Optional[int] = None,
+    target_dir: Optional[Path] = None,
+    overwrite: bool = False,
+    delete_source: bool = False,
+    use_processes: bool = True,
+    **kwargs: Any,
+) -> BatchReport:
+    """Uncompress many files in a worker pool, one file per task
+
+    Failures do not stop the batch, they are reported per file. Additional
+    keyword arguments are passed to File.uncompress.
+    """
+
+    return _run_many(
+        files=files,
+        method="uncompress",
+        target_dir=target_dir,
+        workers=workers,
+        use_processes=use_processes,
+        kwargs={
+            **kwargs,
+            "overwrite": overwrite,
+            "delete_source": delete_source,
+        },
+    )
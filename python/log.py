@@ -1,12 +1,38 @@
 # coding=utf-8
-__all__ = ["LoggingMixin", "JsonLoggingFormatter"]
+__all__ = [
+    "LoggingMixin",
+    "RateLimitKey",
+    "RateLimitFilter",
+    "SamplingFilter",
+    "JsonLoggingFormatter",
+    "OverflowPolicy",
+    "AsyncLoggingHandler",
+    "RotatingJsonFileHandler",
+    "SharedMemoryRingBuffer",
+    "SharedMemoryLogHandler",
+    "SharedMemoryLogCollector",
+]
 
+import collections
+import concurrent.futures
 import datetime
-import io
+import enum
 import logging
+import multiprocessing
+import multiprocessing.shared_memory
+import queue
+import random
+import struct
+import sys
+import threading
+import time
 import traceback
 import types
 import typing
+from pathlib import Path
+
+if typing.TYPE_CHECKING:
+    from file import Compression
 
 try:
     import ujson as json
@@ -14,6 +40,13 @@ except ImportError:
     import json
 
 
+_CAUSE_MESSAGE: str = (
+    "\nThe above exception was the direct cause of the following exception:\n\n"
+)
+_CONTEXT_MESSAGE: str = (
+    "\nDuring handling of the above exception, another exception occurred:\n\n"
+)
+
 ExceptionInfo: typing.TypeAlias = typing.Union[
     typing.Tuple[
         typing.Type[BaseException],
@@ -30,15 +63,244 @@ def get_logger_for(cls: typing.Type) -> logging.Logger:
     return logging.getLogger(name=cls.__module__ + "." + cls.__name__)
 
 
+class RateLimitKey(enum.Enum):
+    """What a rate limit applies to"""
+
+    LOGGER = "logger"
+    CALLSITE = "callsite"
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket rate limiting of log records, per logger or per callsite
+
+    Records over the limit are dropped and counted, a "Suppressed N similar
+    messages" record is logged before the next record passing the filter or
+    by a background thread report_interval seconds later at the latest (and
+    on flush/close). Attach it to a logger (not to a handler) so the summary
+    can be logged.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: typing.Optional[int] = None,
+        key: RateLimitKey = RateLimitKey.CALLSITE,
+        report_interval: float = 1.0,
+    ) -> None:
+        """Allow rate records per second on average, burst at once"""
+
+        super().__init__()
+
+        self._rate: float = rate
+        self._burst: float = float(burst if burst is not None else max(rate, 1))
+        self._key: RateLimitKey = key
+        self._report_interval: float = report_interval
+
+        # key -> [tokens, last update, suppressed records, last suppressed]
+        self._buckets: typing.Dict[typing.Tuple, typing.List] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+        # runs only while summaries are pending
+        self._reporter: typing.Optional[threading.Thread] = None
+        self._stopped: threading.Event = threading.Event()
+
+    def _get_key(self, record: logging.LogRecord) -> typing.Tuple:
+        """Get the bucket key of the record"""
+
+        if self._key is RateLimitKey.LOGGER:
+            return (record.name,)
+
+        return record.name, record.pathname, record.lineno
+
+    def _take(
+        self,
+        key: typing.Tuple,
+        record: logging.LogRecord,
+    ) -> typing.Tuple[bool, int]:
+        """Take a token, return if allowed and the count suppressed before"""
+
+        now: float = time.monotonic()
+
+        with self._lock:
+            bucket: typing.Optional[typing.List] = self._buckets.get(key)
+
+            if bucket is None:
+                bucket = self._buckets[key] = [self._burst, now, 0, None]
+
+            tokens: float = min(
+                self._burst, bucket[0] + (now - bucket[1]) * self._rate
+            )
+            bucket[1] = now
+
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                bucket[3] = record
+
+                if self._reporter is None and not self._stopped.is_set():
+                    self._reporter = threading.Thread(
+                        target=self._run_reporter,
+                        name="RateLimitFilter-reporter",
+                        daemon=True,
+                    )
+                    self._reporter.start()
+
+                return False, 0
+
+            bucket[0] = tokens - 1
+            suppressed: int = bucket[2]
+            bucket[2] = 0
+            bucket[3] = None
+
+            return True, suppressed
+
+    def _pop_pending(self) -> typing.List[typing.Tuple[logging.LogRecord, int]]:
+        """Take the last suppressed record and count of every bucket"""
+
+        pending: typing.List[typing.Tuple[logging.LogRecord, int]] = []
+
+        for bucket in self._buckets.values():
+            if bucket[2] > 0:
+                pending.append((bucket[3], bucket[2]))
+                bucket[2] = 0
+                bucket[3] = None
+
+        return pending
+
+    def _run_reporter(self) -> None:
+        """Log the pending summaries periodically, exit once there are none"""
+
+        while not self._stopped.wait(self._report_interval):
+            with self._lock:
+                pending = self._pop_pending()
+
+                if not pending:
+                    self._reporter = None
+                    return
+
+            for record, suppressed in pending:
+                self._log_summary(record=record, suppressed=suppressed)
+
+    @staticmethod
+    def _log_summary(record: logging.LogRecord, suppressed: int) -> None:
+        summary: logging.LogRecord = logging.makeLogRecord(
+            {
+                "name": record.name,
+                "levelno": record.levelno,
+                "levelname": record.levelname,
+                "pathname": record.pathname,
+                "lineno": record.lineno,
+                "funcName": record.funcName,
+                "msg": "Suppressed %d similar messages",
+                "args": (suppressed,),
+                "suppressed": suppressed,
+                # lets the summary pass the rate limit filters
+                "_rate_limit_summary": True,
+            }
+        )
+        logging.getLogger(record.name).handle(summary)
+
+    def flush(self) -> None:
+        """Log the summaries of all suppressed records now"""
+
+        with self._lock:
+            pending = self._pop_pending()
+
+        for record, suppressed in pending:
+            self._log_summary(record=record, suppressed=suppressed)
+
+    def close(self) -> None:
+        """Stop the background thread and log the pending summaries"""
+
+        self._stopped.set()
+
+        reporter: typing.Optional[threading.Thread] = self._reporter
+
+        if reporter is not None and reporter is not threading.current_thread():
+            reporter.join()
+
+        self.flush()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Drop the record if the limit is reached, report suppressed ones"""
+
+        if getattr(record, "_rate_limit_summary", False):
+            return True
+
+        allowed, suppressed = self._take(
+            key=self._get_key(record=record), record=record
+        )
+
+        if allowed and suppressed > 0:
+            self._log_summary(record=record, suppressed=suppressed)
+
+        return allowed
+
+
+class SamplingFilter(logging.Filter):
+    """Let through a random sample of the records below a level"""
+
+    def __init__(
+        self,
+        sample_rate: float,
+        min_level: int = logging.WARNING,
+    ) -> None:
+        """Keep sample_rate (0-1) of the records, all from min_level"""
+
+        super().__init__()
+
+        self._sample_rate: float = sample_rate
+        self._min_level: int = min_level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Keep the record with sample_rate probability"""
+
+        return (
+            record.levelno >= self._min_level or
+            random.random() < self._sample_rate
+        )
+
+
 class LoggingMixin:
     _logger: typing.Union[logging.Logger, None] = None
 
+    # records per second allowed (per callsite by default), None disables
+    _log_rate: typing.Optional[float] = None
+    _log_burst: typing.Optional[int] = None
+    _log_rate_key: RateLimitKey = RateLimitKey.CALLSITE
+    # ratio of records kept below _log_sample_level, None disables
+    _log_sample_rate: typing.Optional[float] = None
+    _log_sample_level: int = logging.WARNING
+
+    def _configure_logger(self, logger: logging.Logger) -> None:
+        """Attach the configured rate limit and sampling filters (once)"""
+
+        types_: typing.Set[type] = {type(f) for f in logger.filters}
+
+        if self._log_sample_rate is not None and SamplingFilter not in types_:
+            logger.addFilter(
+                SamplingFilter(
+                    sample_rate=self._log_sample_rate,
+                    min_level=self._log_sample_level,
+                )
+            )
+
+        if self._log_rate is not None and RateLimitFilter not in types_:
+            logger.addFilter(
+                RateLimitFilter(
+                    rate=self._log_rate,
+                    burst=self._log_burst,
+                    key=self._log_rate_key,
+                )
+            )
+
     @property
     def log(self) -> logging.Logger:
         """Returns a logger instance which is created on first call"""
 
         if self._logger is None:
             self._logger = get_logger_for(cls=self.__class__)
+            self._configure_logger(logger=self._logger)
 
         return self._logger
 
@@ -56,17 +318,37 @@ class JsonLoggingFormatter(logging.Formatter):
         timestamp: bool = True,
         dt_fmt: typing.Optional[str] = None,
         dt_tz: datetime.tzinfo = datetime.timezone.utc,
+        backend: typing.Optional[typing.Any] = None,
+        exc_cache_size: int = 1024,
+        exc_depth: typing.Optional[int] = None,
+        exc_structured: bool = False,
     ) -> None:
-        """Initialize the created instance"""
+        """Initialize the created instance
+
+        backend is an object with dumps and dumpb methods, e.g. a JsonBackend
+        of the serialization package, JsonLoggingFormatter.formatter is used
+        if not given. Rendered stack frames are cached by exception type and code locations
+        (exc_cache_size entries, 0 disables), exc_depth keeps only the most
+        recent frames, exc_structured logs exceptions as objects with a list
+        of frames instead of the text traceback.
+        """
 
         super().__init__()
 
+        self._backend: typing.Optional[typing.Any] = backend
+
         self._fields: typing.List[str] = fields
         self._rename_fields: typing.Dict[str, str] = rename_fields or {}
         self._static_fields: typing.Dict[str, typing.Any] = static_fields or {}
         self._dt_fmt: typing.Optional[str] = dt_fmt
         self._dt_tz: datetime.tzinfo = dt_tz
 
+        self._exc_cache: collections.OrderedDict = collections.OrderedDict()
+        self._exc_cache_size: int = exc_cache_size
+        self._exc_cache_lock: threading.Lock = threading.Lock()
+        self._exc_depth: typing.Optional[int] = exc_depth
+        self._exc_structured: bool = exc_structured
+
         self._uses_time: bool = False
 
         if "asctime" in self._fields:
@@ -78,13 +360,201 @@ class JsonLoggingFormatter(logging.Formatter):
 
             self._uses_time = True
 
-    def format_exception(self, exc_info: ExceptionInfo) -> str:
-        """Format the provided exception as a single line"""
+        # (record attribute, output key) pairs, static fields take precedence
+        self._plan: typing.List[typing.Tuple[str, str]] = [
+            (field, self._rename_fields.get(field, field))
+            for field in self._fields
+            if self._rename_fields.get(field, field) not in self._static_fields
+        ]
+        # static fields serialized once, spliced into every output
+        self._static_fragment: bytes = (
+            self._dumpb(self._static_fields)[1:-1]
+            if self._static_fields else b""
+        )
+        self._static_text: str = (
+            self._dumps(self._static_fields)[1:-1]
+            if self._static_fields else ""
+        )
+
+    def _dumps(self, obj: typing.Dict) -> str:
+        if self._backend is None:
+            return JsonLoggingFormatter.formatter(obj)
+
+        return self._backend.dumps(obj)
+
+    def _dumpb(self, obj: typing.Dict) -> bytes:
+        if self._backend is None:
+            return JsonLoggingFormatter.formatter(obj).encode("utf-8")
 
-        string_io: io.StringIO = io.StringIO()
-        traceback.print_exception(*exc_info, limit=None, file=string_io)
-        stack_trace: str = string_io.getvalue()
-        string_io.close()
+        return self._backend.dumpb(obj)
+
+    def _render_frames(
+        self,
+        tb: typing.Optional[types.TracebackType],
+    ) -> typing.Any:
+        """Render the frames of a traceback as text or as a list of frames"""
+
+        summary: traceback.StackSummary = traceback.extract_tb(tb)
+
+        if self._exc_depth is not None:
+            summary = traceback.StackSummary.from_list(
+                summary[-self._exc_depth:] if self._exc_depth > 0 else []
+            )
+
+        if self._exc_structured:
+            return tuple(
+                {
+                    "file": frame.filename,
+                    "line": frame.lineno,
+                    "function": frame.name,
+                    "code": frame.line,
+                }
+                for frame in summary
+            )
+
+        return "".join(summary.format())
+
+    def _cached_frames(self, exc: BaseException) -> typing.Any:
+        """Rendered frames of the exception, looked up by type and locations"""
+
+        tb: typing.Optional[types.TracebackType] = exc.__traceback__
+
+        if self._exc_cache_size <= 0:
+            return self._render_frames(tb=tb)
+
+        # the instruction offset, not only the line, determines the rendered
+        # frame (the column markers of Python 3.11)
+        locations: typing.List[typing.Tuple[types.CodeType, int]] = []
+        current: typing.Optional[types.TracebackType] = tb
+
+        while current is not None:
+            locations.append((current.tb_frame.f_code, current.tb_lasti))
+            current = current.tb_next
+
+        key: typing.Tuple = (type(exc), tuple(locations))
+
+        with self._exc_cache_lock:
+            frames: typing.Any = self._exc_cache.get(key)
+
+            if frames is not None:
+                self._exc_cache.move_to_end(key)
+                return frames
+
+        frames = self._render_frames(tb=tb)
+
+        with self._exc_cache_lock:
+            self._exc_cache[key] = frames
+
+            if len(self._exc_cache) > self._exc_cache_size:
+                self._exc_cache.popitem(last=False)
+
+        return frames
+
+    @staticmethod
+    def _exception_chain(
+        exc: BaseException,
+    ) -> typing.List[typing.Tuple[BaseException, str]]:
+        """List the exception and its causes/contexts, newest first
+
+        Every item holds the message printed after the exception (linking it
+        to the newer one) like traceback.print_exception does.
+        """
+
+        chain: typing.List[typing.Tuple[BaseException, str]] = []
+        seen: typing.Set[int] = set()
+        link: str = ""
+        current: typing.Optional[BaseException] = exc
+
+        while current is not None and id(current) not in seen:
+            seen.add(id(current))
+            chain.append((current, link))
+
+            if current.__cause__ is not None:
+                current, link = current.__cause__, _CAUSE_MESSAGE
+            elif (
+                current.__context__ is not None and
+                not current.__suppress_context__
+            ):
+                current, link = current.__context__, _CONTEXT_MESSAGE
+            else:
+                current = None
+
+        return chain
+
+    def _structure_exception(
+        self,
+        exc: BaseException,
+        seen: typing.Optional[typing.Set[int]] = None,
+    ) -> typing.Dict:
+        """Create an object of the exception, its frames and its cause
+
+        An exception already in the chain (a cycle) is not followed again.
+        """
+
+        seen = seen if seen is not None else set()
+        seen.add(id(exc))
+
+        structured: typing.Dict[str, typing.Any] = {
+            "type": type(exc).__qualname__,
+            "message": str(exc),
+            "frames": self._cached_frames(exc=exc),
+        }
+
+        if exc.__cause__ is not None:
+            if id(exc.__cause__) not in seen:
+                structured["cause"] = self._structure_exception(
+                    exc.__cause__, seen=seen
+                )
+        elif exc.__context__ is not None and not exc.__suppress_context__:
+            if id(exc.__context__) not in seen:
+                structured["context"] = self._structure_exception(
+                    exc.__context__, seen=seen
+                )
+
+        return structured
+
+    def format_exception(
+        self,
+        exc_info: ExceptionInfo,
+    ) -> typing.Union[str, typing.Dict]:
+        """Format the provided exception as a single line (or as an object)
+
+        Chains containing an exception group are rendered with their
+        sub-exceptions by traceback.format_exception, without the cache.
+        """
+
+        exc: typing.Optional[BaseException] = exc_info[1]
+
+        if exc is None:
+            return "NoneType: None"
+
+        if self._exc_structured:
+            return self._structure_exception(exc=exc)
+
+        chain: typing.List[typing.Tuple[BaseException, str]] = \
+            self._exception_chain(exc=exc)
+
+        if any(isinstance(e, BaseExceptionGroup) for e, _ in chain):
+            return "".join(
+                traceback.format_exception(
+                    type(exc),
+                    exc,
+                    exc.__traceback__,
+                    limit=-self._exc_depth if self._exc_depth is not None else None,
+                )
+            ).removesuffix("\n")
+
+        parts: typing.List[str] = []
+
+        for e, link in reversed(chain):
+            if e.__traceback__ is not None:
+                parts.append("Traceback (most recent call last):\n")
+                parts.append(self._cached_frames(exc=e))
+
+            parts.extend(traceback.format_exception_only(type(e), e))
+            parts.append(link)
+
+        stack_trace: str = "".join(parts)
 
         if stack_trace[-1:] == "\n":
             stack_trace = stack_trace[:-1]
@@ -131,19 +601,40 @@ class JsonLoggingFormatter(logging.Formatter):
         self,
         record: logging.LogRecord,
     ) -> typing.Dict[str, typing.Any]:
-        """Create logged values from the provided logging.LogRecord"""
+        """Create logged values from the provided logging.LogRecord
+
+        Static fields are not included, they are spliced in by format.
+        """
+
+        values: typing.Dict[str, typing.Any] = record.__dict__
+
+        return {
+            key: values[field]
+            for field, key in self._plan
+            if values.get(field) is not None
+        }
+
+    def formatb(self, record: logging.LogRecord) -> bytes:
+        """Format the provided logging.LogRecord as UTF-8 encoded bytes
+
+        Handlers writing bytes should use this, it avoids the str round trip
+        with backends producing bytes natively (e.g. orjson).
+        """
+
+        record = self._prepare_record(record=record)
 
-        log_dict: typing.Dict[str, typing.Any] = {}
+        log_dict: typing.Dict[str, typing.Any] = \
+            self._create_log_dict(record=record)
 
-        for field in self._fields:
-            value: typing.Any = record.__dict__.get(field)
+        formatted: bytes = self._dumpb(log_dict)
 
-            if value is not None:
-                # key is either field itself (default) or the renamed variant
-                key: str = self._rename_fields.get(field, field)
-                log_dict[key] = value
+        if not self._static_fragment:
+            return formatted
 
-        return {**log_dict, **self._static_fields}
+        if not log_dict:
+            return b"{" + self._static_fragment + b"}"
+
+        return formatted[:-1] + b"," + self._static_fragment + b"}"
 
     def format(self, record: logging.LogRecord) -> str:
         """Format the provided logging.LogRecord as string, omit None values"""
@@ -153,4 +644,642 @@ class JsonLoggingFormatter(logging.Formatter):
         log_dict: typing.Dict[str, typing.Any] = \
             self._create_log_dict(record=record)
 
-        return JsonLoggingFormatter.formatter(log_dict)
+        formatted: str = self._dumps(log_dict)
+
+        if not self._static_text:
+            return formatted
+
+        if not log_dict:
+            return "{" + self._static_text + "}"
+
+        return formatted[:-1] + "," + self._static_text + "}"
+
+
+class OverflowPolicy(enum.Enum):
+    """What to do with a record if the queue of the handler is full"""
+
+    BLOCK = "block"
+    DROP = "drop"
+    # keep sample_rate of the records, each replacing the oldest queued one
+    SAMPLE = "sample"
+
+
+class AsyncLoggingHandler(logging.Handler):
+    """Format and write log records on a background thread in batches
+
+    The calling thread only enqueues the record, formatting (e.g. with
+    JsonLoggingFormatter) and writing happen on the writer thread, a batch of
+    records is written to the stream with a single write.
+    """
+
+    _sentinel: typing.Any = object()
+
+    def __init__(
+        self,
+        stream: typing.Optional[typing.TextIO] = None,
+        queue_size: int = 10_000,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        sample_rate: float = 0.1,
+        batch_size: int = 512,
+        flush_interval: float = 0.5,
+        level: int = logging.NOTSET,
+    ) -> None:
+        """Initialize the created instance and start the writer thread"""
+
+        super().__init__(level=level)
+
+        self._stream: typing.TextIO = stream or sys.stderr
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._overflow: OverflowPolicy = overflow
+        self._sample_rate: float = sample_rate
+        self._batch_size: int = batch_size
+        self._flush_interval: float = flush_interval
+
+        self._dropped: int = 0
+        self._closing: threading.Event = threading.Event()
+
+        self._thread: threading.Thread = threading.Thread(
+            target=self._run,
+            name=f"{self.__class__.__name__}-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def dropped(self) -> int:
+        """Number of records dropped because the queue was full"""
+
+        return self._dropped
+
+    def _enqueue(self, record: typing.Any) -> None:
+        """Put the record on the queue according to the overflow policy"""
+
+        if self._closing.is_set():
+            # the writer stops once the queue is drained
+            self._dropped += 1
+            return
+
+        if self._overflow is OverflowPolicy.BLOCK:
+            self._queue.put(record)
+            return
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            if (
+                self._overflow is OverflowPolicy.SAMPLE and
+                random.random() < self._sample_rate
+            ):
+                self._evict_and_put(record)
+            else:
+                self._dropped += 1
+
+    def _evict_and_put(self, record: typing.Any) -> None:
+        """Make room by dropping the oldest record, never block the caller"""
+
+        try:
+            evicted: typing.Any = self._queue.get_nowait()
+        except queue.Empty:
+            evicted = None
+        else:
+            self._queue.task_done()
+
+        # the sentinel only wakes up the writer, which checks _closing itself
+        if evicted is not None and evicted is not self._sentinel:
+            self._dropped += 1
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # taken by another thread in the meantime
+            self._dropped += 1
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Enqueue the raw record, formatting is left to the writer thread"""
+
+        try:
+            self._enqueue(record)
+        except Exception:
+            self.handleError(record)
+
+    def _next_batch(self) -> typing.List[typing.Any]:
+        """Wait for a record, then take the available ones up to batch_size"""
+
+        try:
+            batch: typing.List[typing.Any] = [
+                self._queue.get(timeout=self._flush_interval)
+            ]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _write_batch(self, batch: typing.List[logging.LogRecord]) -> None:
+        """Format the records and write them with a single write"""
+
+        lines: typing.List[str] = []
+
+        for record in batch:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+
+        if lines:
+            try:
+                self._stream.write("\n".join(lines) + "\n")
+                self._stream.flush()
+            except Exception:
+                self.handleError(batch[-1])
+
+    def _run(self) -> None:
+        """Writer thread, runs until closing and the queue is drained"""
+
+        while True:
+            batch: typing.List[typing.Any] = self._next_batch()
+
+            self._write_batch(
+                [item for item in batch if item is not self._sentinel]
+            )
+
+            for _ in batch:
+                self._queue.task_done()
+
+            if self._closing.is_set() and self._queue.empty():
+                return
+
+    def flush(self) -> None:
+        """Wait until every enqueued record is written"""
+
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write the remaining records and stop the writer thread"""
+
+        self._closing.set()
+
+        if self._thread.is_alive():
+            try:
+                # wake up the writer, a full queue does so anyway
+                self._queue.put_nowait(self._sentinel)
+            except queue.Full:
+                pass
+
+            self._thread.join()
+
+        super().close()
+
+
+class RotatingJsonFileHandler(logging.Handler):
+    """Write formatted records in batches, rotate and compress the segments
+
+    Records are buffered and written with a single write once batch_size
+    records are buffered, a record of flush_level or above is emitted or
+    flush_interval elapsed (checked by a flusher thread, records are not kept
+    in memory while the logger is idle). The file is rotated when it would
+    exceed max_bytes or when interval elapsed, the rotated segment is
+    compressed (and old segments are removed) on a background thread, the
+    logging thread never waits for it.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: typing.Optional[int] = None,
+        interval: typing.Optional[float] = None,
+        backup_count: typing.Optional[int] = None,
+        compression: typing.Union[str, "Compression", None] = "gzip",
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+        flush_level: int = logging.WARNING,
+        level: int = logging.NOTSET,
+    ) -> None:
+        """Initialize the created instance, open the file, start the flusher"""
+
+        super().__init__(level=level)
+
+        if isinstance(compression, str):
+            # file.py is only needed by this handler, imported on use
+            from file import create_compression
+
+            compression = create_compression(name=compression)()
+
+        self._path: Path = path
+        self._max_bytes: typing.Optional[int] = max_bytes
+        self._interval: typing.Optional[float] = interval
+        self._backup_count: typing.Optional[int] = backup_count
+        self._compression: typing.Optional["Compression"] = compression
+        self._batch_size: int = batch_size
+        self._flush_interval: float = flush_interval
+        self._flush_level: int = flush_level
+
+        self._buffer: typing.List[bytes] = []
+        self._last_flush: float = time.monotonic()
+
+        self._stream: typing.BinaryIO = open(self._path, "ab")
+        self._size: int = self._stream.tell()
+        self._rollover_at: typing.Optional[float] = (
+            time.time() + interval if interval is not None else None
+        )
+
+        self._executor: concurrent.futures.ThreadPoolExecutor = \
+            concurrent.futures.ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix=f"{self.__class__.__name__}-compress",
+            )
+
+        self._stopped: threading.Event = threading.Event()
+        self._flusher: threading.Thread = threading.Thread(
+            target=self._run_flusher,
+            name=f"{self.__class__.__name__}-flusher",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def _encode(self, record: logging.LogRecord) -> bytes:
+        """Format the record as bytes, without str round trip if possible"""
+
+        formatb: typing.Optional[typing.Callable] = getattr(
+            self.formatter, "formatb", None
+        )
+
+        if formatb is not None:
+            return formatb(record)
+
+        return self.format(record).encode("utf-8")
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffer the record, write the buffer if it is due"""
+
+        try:
+            self._buffer.append(self._encode(record))
+
+            if (
+                len(self._buffer) >= self._batch_size or
+                record.levelno >= self._flush_level or
+                time.monotonic() - self._last_flush >= self._flush_interval
+            ):
+                self._write_buffer()
+        except Exception:
+            self.handleError(record)
+
+    def _run_flusher(self) -> None:
+        """Flusher thread, writes the buffer and rotates every flush_interval"""
+
+        while not self._stopped.wait(timeout=self._flush_interval):
+            self.acquire()
+            try:
+                if self._stream.closed:
+                    return
+
+                if time.monotonic() - self._last_flush >= self._flush_interval:
+                    self._write_buffer()
+
+                # an idle file is rotated on time as well
+                if self._should_rollover(size=0):
+                    self._rollover()
+            except Exception:
+                if logging.raiseExceptions:
+                    traceback.print_exc()
+            finally:
+                self.release()
+
+    def _should_rollover(self, size: int) -> bool:
+        """Whether the file has to be rotated before writing size bytes"""
+
+        if self._size == 0:
+            return False
+
+        return (
+            (
+                self._max_bytes is not None and
+                self._size + size > self._max_bytes
+            ) or
+            (
+                self._rollover_at is not None and
+                time.time() >= self._rollover_at
+            )
+        )
+
+    def _write_buffer(self) -> None:
+        """Write the buffered records with a single write"""
+
+        self._last_flush = time.monotonic()
+
+        if not self._buffer:
+            return
+
+        data: bytes = b"\n".join(self._buffer) + b"\n"
+        self._buffer = []
+
+        if self._should_rollover(size=len(data)):
+            self._rollover()
+
+        self._stream.write(data)
+        self._stream.flush()
+        self._size += len(data)
+
+    def _rollover(self) -> None:
+        """Rename the current file and compress it in the background"""
+
+        self._stream.close()
+
+        suffix: str = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        segment: Path = self._path.parent / f"{self._path.name}.{suffix}"
+        self._path.rename(segment)
+
+        self._stream = open(self._path, "ab")
+        self._size = 0
+
+        if self._interval is not None:
+            self._rollover_at = time.time() + self._interval
+
+        future: concurrent.futures.Future = self._executor.submit(
+            self._process_segment, segment
+        )
+        future.add_done_callback(self._report_error)
+
+    def _process_segment(self, segment: Path) -> None:
+        """Compress the rotated segment and remove the old ones"""
+
+        if self._compression is not None:
+            from file import File
+
+            File(path=segment).compress(
+                compression=self._compression,
+                delete_source=True,
+                atomic=True,
+            )
+
+        if self._backup_count is not None:
+            segments: typing.List[Path] = sorted(
+                self._path.parent.glob(f"{self._path.name}.*")
+            )
+
+            for old in segments[:max(len(segments) - self._backup_count, 0)]:
+                old.unlink(missing_ok=True)
+
+    @staticmethod
+    def _report_error(future: concurrent.futures.Future) -> None:
+        """Print background errors like logging.Handler.handleError does"""
+
+        exc: typing.Optional[BaseException] = future.exception()
+
+        if exc is not None and logging.raiseExceptions:
+            traceback.print_exception(type(exc), exc, exc.__traceback__)
+
+    def flush(self) -> None:
+        """Write the buffered records"""
+
+        self.acquire()
+        try:
+            self._write_buffer()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Write the buffered records, wait for the background compression"""
+
+        self._stopped.set()
+        self._flusher.join()
+
+        self.acquire()
+        try:
+            if not self._stream.closed:
+                self._write_buffer()
+                self._stream.close()
+        finally:
+            self.release()
+
+        self._executor.shutdown(wait=True)
+
+        super().close()
+
+
+class SharedMemoryRingBuffer:
+    """Multi-producer, single-consumer byte message ring in shared memory
+
+    Create it before starting the worker processes and pass it to them (it is
+    picklable while spawning processes). Writers and the reader synchronize on
+    a process-shared lock, messages are copied into and out of the buffer
+    without further system calls. Messages which do not fit are dropped.
+    """
+
+    # write position, read position, dropped messages (monotonic counters)
+    _header: struct.Struct = struct.Struct("<QQQ")
+    _length: struct.Struct = struct.Struct("<I")
+
+    def __init__(
+        self,
+        capacity: int = 16 * 1024 * 1024,
+        context: typing.Optional[multiprocessing.context.BaseContext] = None,
+    ) -> None:
+        """Allocate capacity bytes of shared memory for the messages
+
+        Pass the multiprocessing context the workers are started with if it
+        is not the default one.
+        """
+
+        self._capacity: int = capacity
+        self._shm: multiprocessing.shared_memory.SharedMemory = \
+            multiprocessing.shared_memory.SharedMemory(
+                create=True,
+                size=self._header.size + capacity,
+            )
+        self._lock: typing.Any = (context or multiprocessing).Lock()
+        self._owner: bool = True
+
+        self._header.pack_into(self._shm.buf, 0, 0, 0, 0)
+
+    def __getstate__(self) -> typing.Dict[str, typing.Any]:
+        """Only the owner process may unlink the shared memory"""
+
+        return {**self.__dict__, "_owner": False}
+
+    @property
+    def dropped(self) -> int:
+        """Number of messages dropped because the buffer was full"""
+
+        with self._lock:
+            return self._header.unpack_from(self._shm.buf, 0)[2]
+
+    def _copy_in(self, position: int, data: bytes) -> None:
+        """Copy data to the (wrapping) position of the ring"""
+
+        offset: int = position % self._capacity
+        first: int = min(len(data), self._capacity - offset)
+        start: int = self._header.size
+
+        self._shm.buf[start + offset:start + offset + first] = data[:first]
+        self._shm.buf[start:start + len(data) - first] = data[first:]
+
+    def _copy_out(self, position: int, size: int) -> bytes:
+        """Copy size bytes from the (wrapping) position of the ring"""
+
+        offset: int = position % self._capacity
+        first: int = min(size, self._capacity - offset)
+        start: int = self._header.size
+
+        return (
+            bytes(self._shm.buf[start + offset:start + offset + first]) +
+            bytes(self._shm.buf[start:start + size - first])
+        )
+
+    def put(self, message: bytes) -> bool:
+        """Append the message, False if it was dropped"""
+
+        size: int = self._length.size + len(message)
+
+        with self._lock:
+            write, read, dropped = self._header.unpack_from(self._shm.buf, 0)
+
+            if size > self._capacity - (write - read):
+                self._header.pack_into(
+                    self._shm.buf, 0, write, read, dropped + 1
+                )
+                return False
+
+            self._copy_in(write, self._length.pack(len(message)) + message)
+            self._header.pack_into(self._shm.buf, 0, write + size, read, dropped)
+
+        return True
+
+    def get_all(self) -> typing.List[bytes]:
+        """Take every available message, only one process may call this"""
+
+        with self._lock:
+            write, read, _ = self._header.unpack_from(self._shm.buf, 0)
+
+        messages: typing.List[bytes] = []
+        position: int = read
+
+        # only the reader moves the read position, writers never touch
+        # the area between read and write
+        while position < write:
+            (size,) = self._length.unpack(
+                self._copy_out(position, self._length.size)
+            )
+            position += self._length.size
+            messages.append(self._copy_out(position, size))
+            position += size
+
+        if position != read:
+            with self._lock:
+                write, _, dropped = self._header.unpack_from(self._shm.buf, 0)
+                self._header.pack_into(
+                    self._shm.buf, 0, write, position, dropped
+                )
+
+        return messages
+
+    def close(self) -> None:
+        """Detach, the owner also releases the shared memory"""
+
+        self._shm.close()
+
+        if self._owner:
+            self._shm.unlink()
+
+
+class SharedMemoryLogHandler(logging.Handler):
+    """Put formatted records into a SharedMemoryRingBuffer (worker side)"""
+
+    def __init__(
+        self,
+        ring: SharedMemoryRingBuffer,
+        level: int = logging.NOTSET,
+    ) -> None:
+        """Initialize the created instance"""
+
+        super().__init__(level=level)
+
+        self._ring: SharedMemoryRingBuffer = ring
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Format the record and append it to the ring"""
+
+        try:
+            formatb: typing.Optional[typing.Callable] = getattr(
+                self.formatter, "formatb", None
+            )
+
+            if formatb is not None:
+                message: bytes = formatb(record)
+            else:
+                message: bytes = self.format(record).encode("utf-8")
+
+            self._ring.put(message)
+        except Exception:
+            self.handleError(record)
+
+
+class SharedMemoryLogCollector:
+    """Drain a SharedMemoryRingBuffer into a stream (collector side)
+
+    Only one collector may drain a ring. Run it on a thread with start/stop
+    or as the target of a dedicated process with run.
+    """
+
+    def __init__(
+        self,
+        ring: SharedMemoryRingBuffer,
+        stream: typing.BinaryIO,
+        poll_interval: float = 0.05,
+    ) -> None:
+        """Initialize the created instance"""
+
+        self._ring: SharedMemoryRingBuffer = ring
+        self._stream: typing.BinaryIO = stream
+        self._poll_interval: float = poll_interval
+
+        self._stop: threading.Event = threading.Event()
+        self._thread: typing.Optional[threading.Thread] = None
+
+    def drain(self) -> int:
+        """Write every available message with a single write"""
+
+        messages: typing.List[bytes] = self._ring.get_all()
+
+        if messages:
+            self._stream.write(b"\n".join(messages) + b"\n")
+            self._stream.flush()
+
+        return len(messages)
+
+    def run(self, stop: typing.Optional[typing.Any] = None) -> None:
+        """Drain until stop (a threading or multiprocessing Event) is set"""
+
+        stop = stop or self._stop
+
+        while not stop.is_set():
+            if self.drain() == 0:
+                stop.wait(self._poll_interval)
+
+        self.drain()
+
+    def start(self) -> None:
+        """Drain on a background thread"""
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run,
+            name=f"{self.__class__.__name__}-drain",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread after draining the ring"""
+
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,266 @@
+# coding=utf-8
+from __future__ import annotations
+
+import dataclasses
+import functools
+import inspect
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar, Union, overload
+
+R = TypeVar("R")
+
+# sub-buckets per power of two, relative error of the percentiles ~1/2^(n+1)
+_SUB_BUCKET_BITS: int = 3
+# durations buffered per function before they are added to the histogram
+_PENDING_SIZE: int = 1024
+
+_enabled: bool = True
+_stats: dict[str, FunctionStats] = {}
+_stats_lock: threading.Lock = threading.Lock()
+
+
+def _bucket(ns: int) -> int:
+    """Log-linear histogram bucket of a duration"""
+
+    bits: int = ns.bit_length()
+
+    if bits <= _SUB_BUCKET_BITS + 1:
+        return ns
+
+    shift: int = bits - _SUB_BUCKET_BITS - 1
+    return (shift << _SUB_BUCKET_BITS) + (ns >> shift)
+
+
+def _bucket_value(bucket: int) -> int:
+    """Representative (middle) duration of a bucket"""
+
+    if bucket < 1 << (_SUB_BUCKET_BITS + 1):
+        return bucket
+
+    shift: int = (bucket >> _SUB_BUCKET_BITS) - 1
+    base: int = bucket - (shift << _SUB_BUCKET_BITS)
+    return (base << shift) + (1 << shift) // 2
+
+
+@dataclasses.dataclass(frozen=True)
+class FunctionProfile(object):
+    name: str
+    count: int
+    sample_rate: float
+    total_s: float
+    mean_s: float
+    p50_s: float
+    p95_s: float
+    p99_s: float
+    max_s: float
+
+
+class FunctionStats(object):
+    """Count, total, max and histogram of the durations of one function
+
+    Durations are appended to a buffer (atomic, no locking on the hot path)
+    and added to the histogram in bulk. A duration recorded by another thread
+    at the very moment of a fold may be lost.
+    """
+
+    def __init__(self, name: str, sample_rate: float) -> None:
+        self._name: str = name
+        self._sample_rate: float = sample_rate
+        self._lock: threading.Lock = threading.Lock()
+
+        self._count: int = 0
+        self._total_ns: int = 0
+        self._max_ns: int = 0
+        self._histogram: dict[int, int] = {}
+        self._pending: list[int] = []
+
+    def reset(self) -> None:
+        with self._lock:
+            self._count = 0
+            self._total_ns = 0
+            self._max_ns = 0
+            self._histogram = {}
+            self._pending = []
+
+    def record(self, ns: int) -> None:
+        self._pending.append(ns)
+
+        if len(self._pending) >= _PENDING_SIZE:
+            with self._lock:
+                self._fold()
+
+    def _fold(self) -> None:
+        """Add the buffered durations to the histogram, hold the lock"""
+
+        pending: list[int] = self._pending
+        self._pending = []
+
+        if not pending:
+            return
+
+        histogram: dict[int, int] = self._histogram
+
+        for ns in pending:
+            bucket: int = _bucket(ns)
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+
+        self._count += len(pending)
+        self._total_ns += sum(pending)
+        self._max_ns = max(self._max_ns, max(pending))
+
+    def _percentiles(self, *quantiles: float) -> list[int]:
+        """Durations at the quantiles, from the histogram"""
+
+        results: list[int] = []
+        buckets: list[tuple[int, int]] = sorted(self._histogram.items())
+
+        for q in quantiles:
+            rank: float = q * self._count
+            seen: int = 0
+
+            for bucket, count in buckets:
+                seen += count
+
+                if seen >= rank:
+                    results.append(min(_bucket_value(bucket), self._max_ns))
+                    break
+            else:
+                results.append(self._max_ns)
+
+        return results
+
+    def snapshot(self) -> FunctionProfile:
+        with self._lock:
+            self._fold()
+
+            p50, p95, p99 = self._percentiles(0.5, 0.95, 0.99)
+
+            return FunctionProfile(
+                name=self._name,
+                count=self._count,
+                sample_rate=self._sample_rate,
+                total_s=self._total_ns / 1e9,
+                mean_s=self._total_ns / self._count / 1e9 if self._count else 0.0,
+                p50_s=p50 / 1e9,
+                p95_s=p95 / 1e9,
+                p99_s=p99 / 1e9,
+                max_s=self._max_ns / 1e9,
+            )
+
+
+def enable_profiling() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable_profiling() -> None:
+    """Profiled functions are called directly until enabled again"""
+
+    global _enabled
+    _enabled = False
+
+
+def reset_profiling() -> None:
+    with _stats_lock:
+        stats: list[FunctionStats] = list(_stats.values())
+
+    for s in stats:
+        s.reset()
+
+
+def profiling_snapshot() -> list[FunctionProfile]:
+    with _stats_lock:
+        stats: list[FunctionStats] = list(_stats.values())
+
+    return [s.snapshot() for s in stats]
+
+
+def write_profiling_snapshot(path: Path, formatter: Optional[Any] = None) -> None:
+    """Write the snapshot with a serialization Formatter, JSON by default"""
+
+    if formatter is None:
+        from serialization import JsonFormatter
+
+        formatter = JsonFormatter()
+
+    formatter.write(path, profiling_snapshot())
+
+
+def _get_stats(name: str, sample_rate: float) -> FunctionStats:
+    with _stats_lock:
+        if name not in _stats:
+            _stats[name] = FunctionStats(name, sample_rate)
+
+        return _stats[name]
+
+
+@overload
+def profile(f: Callable[..., R]) -> Callable[..., R]:
+    ...
+
+
+@overload
+def profile(
+    *,
+    sample_rate: float = 1.0,
+    name: Optional[str] = None,
+) -> Callable[[Callable[..., R]], Callable[..., R]]:
+    ...
+
+
+def profile(
+    f: Optional[Callable[..., R]] = None,
+    *,
+    sample_rate: float = 1.0,
+    name: Optional[str] = None,
+) -> Union[Callable[..., R], Callable[[Callable[..., R]], Callable[..., R]]]:
+    """Aggregate the durations of the calls in memory, see profiling_snapshot
+
+    Use as @profile or @profile(sample_rate=0.01), only sample_rate of the
+    calls are measured. Works with coroutine functions as well.
+    """
+
+    def decorator(f_: Callable[..., R]) -> Callable[..., R]:
+        stats: FunctionStats = _get_stats(
+            name=name or f"{f_.__module__}.{f_.__qualname__}",
+            sample_rate=sample_rate,
+        )
+
+        if inspect.iscoroutinefunction(f_):
+            @functools.wraps(f_)
+            async def async_inner(*args: Any, **kwargs: Any) -> R:
+                if not _enabled or (
+                    sample_rate < 1.0 and random.random() >= sample_rate
+                ):
+                    return await f_(*args, **kwargs)
+
+                start: int = time.perf_counter_ns()
+                try:
+                    return await f_(*args, **kwargs)
+                finally:
+                    stats.record(time.perf_counter_ns() - start)
+
+            return async_inner
+
+        @functools.wraps(f_)
+        def inner(*args: Any, **kwargs: Any) -> R:
+            if not _enabled or (
+                sample_rate < 1.0 and random.random() >= sample_rate
+            ):
+                return f_(*args, **kwargs)
+
+            start: int = time.perf_counter_ns()
+            try:
+                return f_(*args, **kwargs)
+            finally:
+                stats.record(time.perf_counter_ns() - start)
+
+        return inner
+
+    if f is not None:
+        return decorator(f)
+
+    return decorator
@@ -1,3 +1,18 @@
 # coding=utf-8
+from .core import *
 from .decorators import *
 from .formatters import *
+
+# importing columnar imports pyarrow, it is only done once it is used
+_COLUMNAR_NAMES: frozenset = frozenset(
+    {"Columns", "ParquetParameters", "ParquetDataFormatter"}
+)
+
+
+def __getattr__(name: str):
+    if name in _COLUMNAR_NAMES:
+        from . import columnar
+
+        return getattr(columnar, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
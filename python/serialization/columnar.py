@@ -0,0 +1,335 @@
+# coding=utf-8
+__all__ = [
+    "Columns",
+    "ParquetParameters",
+    "ParquetDataFormatter",
+]
+
+import dataclasses
+import datetime
+import decimal
+import enum
+import itertools
+import types
+import typing
+from pathlib import Path
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from .core import DataFormatter, Formatter, Parameters, T
+from .formatters import JsonFormatter
+
+Columns = dict[str, list[typing.Any]]
+
+_NONE_TYPE = type(None)
+
+
+@dataclasses.dataclass(frozen=True)
+class _Column(object):
+    """Arrow type of a field and the conversions of its values
+
+    The conversions of single values are used in nested types, the ones of
+    many values (if set) for whole columns.
+    """
+
+    name: str
+    type: typing.Any
+    to_arrow: typing.Optional[typing.Callable[[typing.Any], typing.Any]] = None
+    from_arrow: typing.Optional[typing.Callable[[typing.Any], typing.Any]] = None
+    to_arrow_many: typing.Optional[typing.Callable[[list], list]] = None
+    from_arrow_many: typing.Optional[typing.Callable[[list], list]] = None
+
+    def encode(self, values: list) -> list:
+        if self.to_arrow_many is not None:
+            return self.to_arrow_many(values)
+        if self.to_arrow is not None:
+            return [self.to_arrow(value) for value in values]
+
+        return values
+
+    def decode(self, values: list) -> list:
+        if self.from_arrow_many is not None:
+            return self.from_arrow_many(values)
+        if self.from_arrow is not None:
+            return [self.from_arrow(value) for value in values]
+
+        return values
+
+
+def _nullable(
+    convert: typing.Optional[typing.Callable[[typing.Any], typing.Any]],
+) -> typing.Optional[typing.Callable[[typing.Any], typing.Any]]:
+    if convert is None:
+        return None
+
+    return lambda value: None if value is None else convert(value)
+
+
+def _column(name: str, hint: typing.Any, formatter: Formatter) -> _Column:
+    """Map a type hint to an arrow type, unknown types are stored as JSON"""
+
+    origin = typing.get_origin(hint)
+    args = typing.get_args(hint)
+
+    if origin in (typing.Union, types.UnionType) and _NONE_TYPE in args:
+        others = [arg for arg in args if arg is not _NONE_TYPE]
+
+        if len(others) == 1:
+            column = _column(name, others[0], formatter)
+
+            return dataclasses.replace(
+                column,
+                to_arrow=_nullable(column.to_arrow),
+                from_arrow=_nullable(column.from_arrow),
+                to_arrow_many=None,
+                from_arrow_many=None,
+            )
+
+    if origin in (list, typing.List) and len(args) == 1:
+        item = _column(name, args[0], formatter)
+
+        return _Column(
+            name=name,
+            type=pyarrow.list_(item.type),
+            to_arrow=(
+                None if item.to_arrow is None
+                else lambda value: [item.to_arrow(v) for v in value]
+            ),
+            from_arrow=(
+                None if item.from_arrow is None
+                else lambda value: [item.from_arrow(v) for v in value]
+            ),
+        )
+
+    if isinstance(hint, type):
+        # bool before int, bool is a subclass of int
+        for cls, arrow_type in (
+            (bool, pyarrow.bool_()),
+            (int, pyarrow.int64()),
+            (float, pyarrow.float64()),
+            (str, pyarrow.string()),
+            (bytes, pyarrow.binary()),
+            (datetime.datetime, pyarrow.timestamp("us", tz="UTC")),
+            (datetime.date, pyarrow.date32()),
+            (decimal.Decimal, pyarrow.string()),
+        ):
+            if issubclass(hint, cls) and not issubclass(hint, enum.Enum):
+                if cls is decimal.Decimal:
+                    return _Column(name, arrow_type, str, decimal.Decimal)
+
+                return _Column(name, arrow_type)
+
+        if issubclass(hint, enum.Enum):
+            return _Column(
+                name=name,
+                type=pyarrow.string(),
+                to_arrow=lambda value: value.name,
+                from_arrow=lambda value: hint[value],
+            )
+
+        if dataclasses.is_dataclass(hint):
+            fields = _columns(hint, formatter)
+
+            def to_arrow(value: typing.Any) -> dict:
+                return {
+                    f.name: (
+                        getattr(value, f.name) if f.to_arrow is None
+                        else f.to_arrow(getattr(value, f.name))
+                    )
+                    for f in fields
+                }
+
+            def from_arrow(value: dict) -> typing.Any:
+                return hint(
+                    **{
+                        f.name: (
+                            value[f.name] if f.from_arrow is None
+                            else f.from_arrow(value[f.name])
+                        )
+                        for f in fields
+                    }
+                )
+
+            return _Column(
+                name=name,
+                type=pyarrow.struct([(f.name, f.type) for f in fields]),
+                to_arrow=to_arrow,
+                from_arrow=from_arrow,
+            )
+
+    # whole columns are converted in batches, see Formatter.dump_many
+    return _Column(
+        name=name,
+        type=pyarrow.string(),
+        to_arrow=formatter.dumps,
+        from_arrow=lambda value: formatter.loads(value, cls=hint),
+        to_arrow_many=lambda values: [
+            formatter._convert_obj_to_str(value)
+            for value in formatter.dump_many(values)
+        ],
+        from_arrow_many=lambda values: formatter.load_many(
+            [formatter._convert_str_to_obj(value) for value in values],
+            cls=hint,
+        ),
+    )
+
+
+def _columns(cls: type, formatter: Formatter) -> list[_Column]:
+    # the annotations of @serializable classes are removed, the ones of the
+    # generated __init__ are kept
+    hints = typing.get_type_hints(cls.__init__)
+
+    return [
+        _column(field.name, hints.get(field.name, field.type), formatter)
+        for field in dataclasses.fields(cls)
+        if field.init
+    ]
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ParquetParameters(Parameters):
+    compression: typing.Optional[str] = "zstd"
+    compression_level: typing.Optional[int] = None
+    use_dictionary: typing.Optional[bool] = None
+    write_statistics: typing.Optional[bool] = None
+
+
+class ParquetDataFormatter(DataFormatter[Columns]):
+    """Columnar Parquet files of dataclasses, requires the pyarrow package
+
+    The schema is derived from the fields: bool, int, float, str, bytes,
+    datetime (stored in UTC), date, Decimal, Enum (by name), Optional, list
+    and nested dataclasses map to Parquet types, other fields are stored as
+    JSON strings with the formatter.
+    """
+
+    def __init__(
+        self,
+        parameters: ParquetParameters = ParquetParameters(),
+        formatter: typing.Optional[Formatter] = None,
+    ) -> None:
+        if pyarrow is None:
+            raise ImportError("ParquetDataFormatter requires the pyarrow package")
+
+        self._parameters: ParquetParameters = parameters
+        self._formatter: Formatter = formatter or JsonFormatter()
+        self._columns: dict[type, list[_Column]] = {}
+
+    def load_data(self, data: str) -> Columns:
+        raise TypeError("Parquet is binary, use loadb_data instead")
+
+    def dump_data(self, data: Columns) -> str:
+        raise TypeError("Parquet is binary, use dumpb_data instead")
+
+    def loadb_data(self, data: bytes, encoding: str = "utf-8") -> Columns:
+        return pyarrow.parquet.read_table(pyarrow.BufferReader(data)).to_pydict()
+
+    def dumpb_data(self, data: Columns, encoding: str = "utf-8") -> bytes:
+        sink = pyarrow.BufferOutputStream()
+
+        pyarrow.parquet.write_table(
+            pyarrow.table(data),
+            sink,
+            **self._parameters.as_dict(),
+        )
+
+        return sink.getvalue().to_pybytes()
+
+    def _get_columns(self, cls: type) -> list[_Column]:
+        if cls not in self._columns:
+            if not dataclasses.is_dataclass(cls):
+                raise TypeError(f"{cls.__name__} is not a dataclass")
+
+            self._columns[cls] = _columns(cls, self._formatter)
+
+        return self._columns[cls]
+
+    def schema(self, cls: type) -> "pyarrow.Schema":
+        return pyarrow.schema(
+            [(column.name, column.type) for column in self._get_columns(cls)]
+        )
+
+    def write(
+        self,
+        path: Path,
+        objs: typing.Iterable[T],
+        cls: typing.Type[T],
+        row_group_size: int = 65536,
+    ) -> int:
+        """Write instances of cls in row groups of row_group_size
+
+        Only one row group is held in memory, objs can be a generator of any
+        length. Returns the number of rows written.
+        """
+
+        columns = self._get_columns(cls)
+        schema = self.schema(cls)
+        count: int = 0
+        objs = iter(objs)
+
+        with pyarrow.parquet.ParquetWriter(
+            path,
+            schema,
+            **self._parameters.as_dict(),
+        ) as writer:
+            while True:
+                batch: list[T] = list(itertools.islice(objs, row_group_size))
+
+                if not batch:
+                    return count
+
+                arrays = []
+
+                for column in columns:
+                    values = column.encode([getattr(obj, column.name) for obj in batch])
+                    arrays.append(pyarrow.array(values, type=column.type))
+
+                writer.write_table(
+                    pyarrow.Table.from_arrays(arrays, schema=schema),
+                    row_group_size=row_group_size,
+                )
+                count += len(batch)
+
+    def read_columns(
+        self,
+        path: Path,
+        columns: typing.Optional[typing.Sequence[str]] = None,
+        cls: typing.Optional[type] = None,
+    ) -> Columns:
+        """Read only the given columns, decoded to the field types of cls if set"""
+
+        data: Columns = pyarrow.parquet.read_table(path, columns=columns).to_pydict()
+
+        if cls is not None:
+            for column in self._get_columns(cls):
+                if column.name in data:
+                    data[column.name] = column.decode(data[column.name])
+
+        return data
+
+    def iter_load(
+        self,
+        path: Path,
+        cls: typing.Type[T],
+        batch_size: int = 65536,
+    ) -> typing.Iterator[T]:
+        """Read instances of cls, batch_size rows at a time"""
+
+        columns = self._get_columns(cls)
+        file = pyarrow.parquet.ParquetFile(path)
+
+        for batch in file.iter_batches(
+            batch_size=batch_size,
+            columns=[column.name for column in columns],
+        ):
+            values = [
+                column.decode(batch.column(column.name).to_pylist())
+                for column in columns
+            ]
+
+            for row in zip(*values):
+                yield cls(**{column.name: value for column, value in zip(columns, row)})
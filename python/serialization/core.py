@@ -1,17 +1,150 @@
 # coding=utf-8
+__all__ = [
+    "T",
+    "D",
+    "StripAttrType",
+    "StateHolder",
+    "Serializer",
+    "Deserializer",
+    "ClassSerializer",
+    "ClassDeserializer",
+    "Durability",
+    "write_bytes",
+    "Parameters",
+    "LazyObject",
+    "materialize",
+    "lazy_data",
+    "Formatter",
+    "BinaryFormatter",
+    "DataFormatter",
+]
+
 import abc
+import concurrent.futures
+import contextlib
 import dataclasses
+import functools
+import inspect
+import io
+import sys
+import types
 import typing
 from pathlib import Path
 
 import jsons
 
+try:
+    from ..durability import Durability, atomic_target
+except ImportError:
+    from durability import Durability, atomic_target
+
 
 T = typing.TypeVar("T")
 D = typing.TypeVar("D")
 StripAttrType = typing.Union[str, typing.MutableSequence[str], tuple[str]]
 StateHolder = jsons.fork()
 
+_NONE_TYPE = type(None)
+_PRIMITIVES = (str, int, float, bool)
+# key of the meta data jsons adds to verbose dumps
+_META_ATTR = "-meta"
+# attributes jsons never dumps regardless of the strip options
+_RESERVED_ATTRS = frozenset(
+    {
+        "json",
+        *dir(jsons.JsonSerializable),
+        "_abc_registry",
+        "_abc_cache",
+        "_abc_negative_cache",
+        "_abc_negative_cache_version",
+        "_abc_impl",
+    }
+)
+
+
+def _get_type_hints(cls: type) -> dict[str, typing.Any]:
+    """Type hints of the attributes and the constructor arguments of a class
+
+    Resolved the way jsons does, the hints of the constructor take precedence
+    (@serializable removes the annotations of the dataclass fields).
+    """
+
+    hints: dict[str, typing.Any] = {}
+
+    for obj in (cls, cls.__init__):
+        try:
+            hints.update(typing.get_type_hints(obj))
+        except NameError:
+            # e.g. a generated constructor, resolve in the module of the class
+            hints.update(
+                typing.get_type_hints(obj, globalns=vars(sys.modules[cls.__module__]))
+            )
+
+    hints.pop("return", None)
+
+    return hints
+
+
+def _can_be_none(hint: typing.Any) -> bool:
+    """Whether None is a valid value for a type hint"""
+
+    if hint in (typing.Any, object, None, _NONE_TYPE):
+        return True
+
+    return (
+        typing.get_origin(hint) in (typing.Union, types.UnionType)
+        and _NONE_TYPE in typing.get_args(hint)
+    )
+
+
+def _passthrough_classes(hint: typing.Optional[type]) -> frozenset:
+    """Classes of the values jsons returns unchanged for a type hint"""
+
+    if hint is None:
+        return frozenset({*_PRIMITIVES, _NONE_TYPE})
+
+    if hint in _PRIMITIVES:
+        return frozenset({hint})
+
+    args = typing.get_args(hint)
+
+    if (
+        typing.get_origin(hint) in (typing.Union, types.UnionType)
+        and len(args) == 2
+        and _NONE_TYPE in args
+    ):
+        other = args[0] if args[1] is _NONE_TYPE else args[1]
+
+        if other in _PRIMITIVES:
+            return frozenset({other, _NONE_TYPE})
+
+    return frozenset()
+
+
+def _dump_attribute(
+    value: object,
+    hint: typing.Optional[type],
+    options: dict,
+    fork_inst: type,
+    kwargs: dict,
+) -> object:
+    """Dump a single attribute the same way jsons.default_object_serializer does"""
+
+    attr_type = hint or type(value)
+    jsons.announce_class(attr_type, fork_inst=fork_inst)
+    serializer = jsons.get_serializer(attr_type, fork_inst)
+
+    try:
+        return serializer(value, cls=hint, **options, **kwargs)
+    except Exception as err:
+        raise jsons.SerializationError(message=err.args[0]) from err
+
+
+def _compile_function(name: str, lines: list[str], namespace: dict) -> typing.Callable:
+    exec("\n".join(lines), namespace)
+
+    return namespace[name]
+
 
 class Serializer(typing.Generic[T]):
     @abc.abstractmethod
@@ -52,6 +185,123 @@ class ClassSerializer(Serializer[T]):
             }
         )
 
+    def _compilable(self, cls: type) -> bool:
+        if (
+            not dataclasses.is_dataclass(cls)
+            or "__slots__" in cls.__dict__
+            or not self.strict
+            or not self.strip_properties
+            or not self.strip_class_variables
+            or jsons.Verbosity.from_value(self.verbose)
+            is not jsons.Verbosity.WITH_NOTHING
+        ):
+            return False
+
+        class_attrs = {name for cls_ in cls.__mro__ for name in cls_.__dict__}
+
+        return not any(
+            field.name.startswith("__")
+            or field.name in _RESERVED_ATTRS
+            or field.name in class_attrs
+            for field in dataclasses.fields(cls)
+        )
+
+    def compile(self, cls: typing.Type[T]) -> Serializer[T]:
+        """Generate a serializer specialized to the fields of a dataclass
+
+        The generated function reads the fields directly instead of reflecting
+        over the object on every call and passes str, int, float, bool and
+        None values through as they are (custom serializers registered for
+        these types are not called). Anything it does not cover (class
+        variables, properties, verbose output, extra instance attributes,
+        an explicit cls) is handled by this serializer, the result is the
+        same as the one of jsons.
+        """
+
+        if not self._compilable(cls):
+            return self
+
+        strip_attr = self.strip_attr or ()
+
+        if not isinstance(strip_attr, (typing.MutableSequence, tuple)):
+            strip_attr = (strip_attr,)
+
+        names = sorted(field.name for field in dataclasses.fields(cls))
+        attributes = [
+            name
+            for name in names
+            if name not in strip_attr
+            and not (self.strip_privates and name.startswith("_"))
+        ]
+
+        namespace = {
+            "_cls": cls,
+            "_names": frozenset(names),
+            "_fallback": self,
+            "_dump_attribute": _dump_attribute,
+            "_verbose": jsons.Verbosity.WITH_NOTHING,
+            "_options": {
+                "key_transformer": self.key_transformer,
+                "strip_nulls": self.strip_nulls,
+                "strip_privates": self.strip_privates,
+                "strip_properties": self.strip_properties,
+                "strip_class_variables": self.strip_class_variables,
+                "strip_attr": tuple(strip_attr),
+            },
+            "_resolved": False,
+        }
+
+        def resolve() -> None:
+            # type hints may be forward references, resolve on the first call
+            hints = _get_type_hints(cls)
+
+            for i, name in enumerate(attributes):
+                namespace[f"_hint_{i}"] = hints.get(name)
+                namespace[f"_passthrough_{i}"] = _passthrough_classes(hints.get(name))
+
+            namespace["_resolved"] = True
+
+        namespace["_resolve"] = resolve
+
+        lines = [
+            "def dump(obj, cls=None, *, key_transformer=None, strip_nulls=False,",
+            "         strip_privates=False, strip_properties=False,",
+            "         strip_class_variables=False, strip_attr=None, verbose=False,",
+            "         strict=False, fork_inst=None, **kwargs):",
+            "    if (cls is not None or fork_inst is None or obj.__class__ is not _cls",
+            "            or obj.__dict__.keys() != _names):",
+            "        return _fallback(obj, cls=cls, fork_inst=fork_inst, **kwargs)",
+            "    if not _resolved:",
+            "        _resolve()",
+            "    kwargs = {**kwargs, 'fork_inst': fork_inst, 'verbose': _verbose,",
+            "              'strict': True, '_store_cls': False}",
+            "    result = {}",
+        ]
+
+        for i, name in enumerate(attributes):
+            key = self.key_transformer(name) if self.key_transformer else name
+
+            lines += [
+                f"    value = obj.{name}",
+                f"    if value.__class__ not in _passthrough_{i}:",
+                f"        value = _dump_attribute(value, _hint_{i}, _options, fork_inst, kwargs)",
+            ]
+
+            if self.strip_nulls:
+                lines += [
+                    "    if value is not None:",
+                    f"        result[{key!r}] = value",
+                ]
+            else:
+                lines.append(f"    result[{key!r}] = value")
+
+        lines.append("    return result")
+
+        function = _compile_function("dump", lines, namespace)
+        function.__serializer__ = self
+
+        return function
+
 
 @dataclasses.dataclass(frozen=True)
 class ClassDeserializer(Deserializer[T]):
@@ -69,16 +319,391 @@ class ClassDeserializer(Deserializer[T]):
             }
         )
 
+    def compile(self, cls: typing.Type[T]) -> Deserializer[T]:
+        """Generate a deserializer specialized to the constructor of a class
+
+        The generated function looks up the constructor arguments directly and
+        passes str, int, float, bool and None values through if they already
+        match the type hint. Anything it does not cover (meta data, attribute
+        getters, unknown keys, missing required keys) is handled by this deserializer,
+        the result is the same as the one of jsons.
+        """
+
+        parameters = [
+            parameter
+            for name, parameter in inspect.signature(cls.__init__).parameters.items()
+            if name != "self"
+        ]
+
+        if not all(
+            parameter.kind
+            in (
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                inspect.Parameter.KEYWORD_ONLY,
+            )
+            for parameter in parameters
+        ):
+            return self
+
+        namespace = {
+            "_cls": cls,
+            "_keys": frozenset(parameter.name for parameter in parameters),
+            "_fallback": self,
+            "_load": jsons.load,
+            "_key_transformer": self.key_transformer,
+            "_resolved": False,
+        }
+
+        def resolve() -> None:
+            # type hints may be forward references, resolve on the first call
+            hints = _get_type_hints(cls)
+
+            required = set()
+
+            for i, parameter in enumerate(parameters):
+                hint = hints.get(parameter.name)
+
+                namespace[f"_hint_{i}"] = hint
+                namespace[f"_passthrough_{i}"] = _passthrough_classes(hint)
+
+                if parameter.default is not inspect.Parameter.empty:
+                    namespace[f"_default_{i}"] = parameter.default
+                elif _can_be_none(hint):
+                    namespace[f"_default_{i}"] = None
+                else:
+                    required.add(parameter.name)
+
+            namespace["_required"] = frozenset(required)
+            namespace["_resolved"] = True
+
+        namespace["_resolve"] = resolve
+
+        lines = [
+            "def load(obj, cls, **kwargs):",
+            "    if (cls is not _cls or obj.__class__ is not dict",
+            "            or kwargs.get('meta_hints') or kwargs.get('attr_getters')):",
+            "        return _fallback(obj, cls, **kwargs)",
+        ]
+
+        if self.key_transformer:
+            lines.append("    data = {_key_transformer(key): obj[key] for key in obj}")
+        else:
+            lines.append("    data = obj")
+
+        lines += [
+            "    if not _resolved:",
+            "        _resolve()",
+            "    if not _required <= data.keys() or not data.keys() <= _keys:",
+            "        return _fallback(obj, cls, **kwargs)",
+            "    meta_hints = kwargs.pop('meta_hints', {})",
+            "    kwargs.pop('attr_getters', None)",
+            f"    kwargs['strict'] = {self.strict!r}",
+        ]
+
+        if self.key_transformer:
+            lines.append("    kwargs['key_transformer'] = _key_transformer")
+
+        for i, parameter in enumerate(parameters):
+            load_lines = [
+                f"value_{i} = data[{parameter.name!r}]",
+                f"if value_{i}.__class__ not in _passthrough_{i}:",
+                f"    value_{i} = _load(value_{i}, _hint_{i}, meta_hints=meta_hints, **kwargs)",
+            ]
+
+            # missing optional arguments get their default (not deserialized)
+            # or None, required ones are checked above
+            lines += [
+                f"    if {parameter.name!r} in data:",
+                *(f"        {line}" for line in load_lines),
+                "    else:",
+                f"        value_{i} = _default_{i}",
+            ]
+
+        arguments = ", ".join(
+            f"{parameter.name}=value_{i}" for i, parameter in enumerate(parameters)
+        )
+        lines.append(f"    return _cls({arguments})")
+
+        function = _compile_function("load", lines, namespace)
+        function.__deserializer__ = self
+
+        return function
+
+
+def write_bytes(
+    path: Path,
+    data: bytes,
+    atomic: bool = False,
+    durability: Durability = Durability.NONE,
+) -> None:
+    """Write data to path, optionally through a temporary file and rename"""
+
+    with atomic_target(path, atomic, durability) as write_path:
+        with open(write_path, "wb") as f:
+            f.write(data)
+
+
+@contextlib.contextmanager
+def _line_reader(
+    file: typing.IO,
+    encoding: str = "utf-8",
+    text: bool = False,
+    newline: typing.Optional[str] = None,
+) -> typing.Iterator[typing.IO]:
+    """Wrap a file object so that it can be iterated by lines
+
+    Binary files are decoded if text is set. The wrappers are detached on
+    exit, they would close the file of the caller on collection otherwise.
+    """
+
+    wrappers: list[typing.Union[io.BufferedReader, io.TextIOWrapper]] = []
+    reader: typing.IO = file
+
+    # e.g. the zstandard reader does not support line iteration
+    if not isinstance(file, (io.TextIOBase, io.BufferedIOBase)):
+        reader = io.BufferedReader(reader)
+        wrappers.append(reader)
+
+    if text and not isinstance(file, io.TextIOBase):
+        reader = io.TextIOWrapper(reader, encoding=encoding, newline=newline)
+        wrappers.append(reader)
+
+    try:
+        yield reader
+    finally:
+        for wrapper in reversed(wrappers):
+            wrapper.detach()
+
 
 class Parameters(object):
     def as_dict(self) -> dict:
-        return {key: value for key, value in self.__dict__ if value is not None}
+        return {
+            key: value for key, value in self.__dict__.items() if value is not None
+        }
+
+
+@dataclasses.dataclass(frozen=True)
+class _LazyField(object):
+    hint: typing.Any
+    default: typing.Any = dataclasses.MISSING
+    default_factory: typing.Any = dataclasses.MISSING
+
+
+_lazy_fields: dict[type, dict[str, _LazyField]] = {}
+
+
+def _get_lazy_fields(cls: type) -> dict[str, _LazyField]:
+    if cls not in _lazy_fields:
+        hints = _get_type_hints(cls)
+
+        _lazy_fields[cls] = {
+            field.name: _LazyField(
+                hint=hints.get(field.name),
+                default=field.default,
+                default_factory=field.default_factory,
+            )
+            for field in dataclasses.fields(cls)
+            if field.init
+        }
+
+    return _lazy_fields[cls]
+
+
+def _lazy_class(hint: typing.Any) -> typing.Optional[type]:
+    """The dataclass of a (optional) type hint, loaded lazily"""
+
+    args = typing.get_args(hint)
+
+    if (
+        typing.get_origin(hint) in (typing.Union, types.UnionType)
+        and len(args) == 2
+        and _NONE_TYPE in args
+    ):
+        hint = args[0] if args[1] is _NONE_TYPE else args[1]
+
+    if isinstance(hint, type) and dataclasses.is_dataclass(hint):
+        return hint
+
+    return None
+
+
+class LazyObject(object):
+    """Read-only view of a serialized dataclass instance
+
+    The fields are loaded on first access and cached, nested dataclasses are
+    views as well. Nothing is validated before it is accessed. The view is not
+    an instance of the class, methods and properties are not available, see
+    materialize.
+    """
+
+    __slots__ = (
+        "_lazy_data",
+        "_lazy_cls",
+        "_lazy_formatter",
+        "_lazy_kwargs",
+        "_lazy_keys",
+        "_lazy_values",
+    )
+
+    def __init__(
+        self,
+        data: dict,
+        cls: type,
+        formatter: "Formatter",
+        kwargs: dict,
+    ) -> None:
+        object.__setattr__(self, "_lazy_data", data)
+        object.__setattr__(self, "_lazy_cls", cls)
+        object.__setattr__(self, "_lazy_formatter", formatter)
+        object.__setattr__(self, "_lazy_kwargs", kwargs)
+        object.__setattr__(self, "_lazy_keys", None)
+        object.__setattr__(self, "_lazy_values", {})
+
+    def _lazy_key(self, name: str) -> str:
+        """The key of a field in the data, see ClassDeserializer.key_transformer"""
+
+        if self._lazy_keys is None:
+            deserializer = jsons.get_deserializer(
+                self._lazy_cls,
+                self._lazy_formatter._fork_inst,
+            )
+            deserializer = getattr(deserializer, "__deserializer__", deserializer)
+            key_transformer = getattr(deserializer, "key_transformer", None)
+
+            object.__setattr__(
+                self,
+                "_lazy_keys",
+                {key_transformer(key): key for key in self._lazy_data}
+                if key_transformer else {},
+            )
+
+        return self._lazy_keys.get(name, name)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        # e.g. copy looks up dunders on an instance without its slots set
+        if name.startswith(("_lazy_", "__")):
+            raise AttributeError(name)
+
+        values: dict = self._lazy_values
+
+        if name in values:
+            return values[name]
+
+        field: typing.Optional[_LazyField] = _get_lazy_fields(self._lazy_cls).get(name)
+
+        if field is None:
+            raise AttributeError(
+                f"{self._lazy_cls.__name__!r} object has no attribute {name!r}"
+            )
+
+        key: str = self._lazy_key(name)
+
+        if key in self._lazy_data:
+            data = self._lazy_data[key]
+            cls = _lazy_class(field.hint)
+
+            if cls is not None and data.__class__ is dict:
+                value = LazyObject(data, cls, self._lazy_formatter, self._lazy_kwargs)
+            else:
+                value = self._lazy_formatter.load(
+                    data,
+                    cls=field.hint,
+                    **self._lazy_kwargs,
+                )
+        elif field.default is not dataclasses.MISSING:
+            value = field.default
+        elif field.default_factory is not dataclasses.MISSING:
+            value = field.default_factory()
+        elif _can_be_none(field.hint):
+            value = None
+        else:
+            raise AttributeError(f"No value found for {name!r}")
+
+        values[name] = value
+
+        return value
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self) -> tuple:
+        # copies and pickles are created from the data, not the loaded values
+        return (
+            type(self),
+            (self._lazy_data, self._lazy_cls, self._lazy_formatter, self._lazy_kwargs),
+        )
+
+    def __dir__(self) -> list[str]:
+        return list(_get_lazy_fields(self._lazy_cls))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._lazy_cls.__name__}, {self._lazy_data!r})"
+
+
+def materialize(obj: T) -> T:
+    """Load a LazyObject into an instance of its class"""
+
+    if not isinstance(obj, LazyObject):
+        return obj
+
+    return obj._lazy_formatter.load(obj._lazy_data, cls=obj._lazy_cls, **obj._lazy_kwargs)
+
+
+def lazy_data(obj: LazyObject) -> dict:
+    """The data of a LazyObject as it was parsed, e.g. to forward it"""
+
+    return obj._lazy_data
+
+
+def _load_chunk(
+    formatter: "Formatter",
+    objs: list[object],
+    cls: type,
+    kwargs: dict,
+) -> list:
+    return formatter.load_many(objs, cls=cls, **kwargs)
+
+
+def _dump_chunk(formatter: "Formatter", objs: list[object], kwargs: dict) -> list:
+    return formatter.dump_many(objs, **kwargs)
+
+
+def _map_chunks(
+    function: typing.Callable[[list[object]], list],
+    objs: list[object],
+    workers: int,
+    chunk_size: int,
+) -> list:
+    chunks = [objs[i:i + chunk_size] for i in range(0, len(objs), chunk_size)]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return [obj for chunk in executor.map(function, chunks) for obj in chunk]
 
 
 class Formatter(metaclass=abc.ABCMeta):
     def __init__(self, fork_inst: typing.Type[StateHolder] = StateHolder) -> None:
         self._fork_inst: typing.Type[StateHolder] = fork_inst
 
+    def __getstate__(self) -> dict:
+        # forks of jsons can not be pickled, the default one is recreated (other
+        # forks are kept, they can be copied)
+        if self._fork_inst is StateHolder:
+            return {**self.__dict__, "_fork_inst": None}
+
+        return self.__dict__.copy()
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+
+        if self._fork_inst is None:
+            self._fork_inst = StateHolder
+
+    def _check_workers(self, workers: int) -> None:
+        if workers > 1 and self._fork_inst is not StateHolder:
+            raise TypeError(
+                "Only formatters of the default StateHolder can use workers"
+            )
+
     @abc.abstractmethod
     def _convert_obj_to_str(self, data: object) -> str:
         pass
@@ -101,6 +726,168 @@ class Formatter(metaclass=abc.ABCMeta):
     def load(self, obj: object, cls: typing.Type[T], **kwargs) -> T:
         return jsons.load(obj, cls=cls, fork_inst=self._fork_inst, **kwargs)
 
+    def load_many(
+        self,
+        objs: typing.Iterable[object],
+        cls: typing.Type[T],
+        workers: int = 1,
+        chunk_size: int = 10000,
+        strict: bool = False,
+        **kwargs,
+    ) -> list[T]:
+        """Load objects of the same class, same result as load on each of them
+
+        The deserializer of cls is looked up once and the caches of jsons are
+        kept for the whole batch (load clears them after every object). With
+        workers > 1 the objects are loaded chunk_size at a time by a process
+        pool, cls has to be importable by the workers and the formatter has to
+        use the default StateHolder.
+        """
+
+        self._check_workers(workers)
+        objs = list(objs)
+
+        if workers > 1 and len(objs) > chunk_size:
+            return _map_chunks(
+                function=functools.partial(
+                    _load_chunk,
+                    self,
+                    cls=cls,
+                    kwargs={**kwargs, "strict": strict},
+                ),
+                objs=objs,
+                workers=workers,
+                chunk_size=chunk_size,
+            )
+
+        if not isinstance(cls, type) or cls is dict:
+            return [self.load(obj, cls=cls, strict=strict, **kwargs) for obj in objs]
+
+        deserializer = jsons.get_deserializer(cls, self._fork_inst)
+        # the arguments jsons.load passes to the deserializer of an object
+        # without meta data
+        kwargs_ = {
+            "meta_hints": {},
+            **kwargs,
+            "strict": strict,
+            "fork_inst": self._fork_inst,
+            "attr_getters": kwargs.get("attr_getters"),
+            "_initial": False,
+            "_inferred_cls": False,
+        }
+        results: list[T] = []
+        # the last object is loaded by load, which clears the caches of jsons
+        last: int = len(objs) - 1
+
+        for i, obj in enumerate(objs):
+            if i == last or obj.__class__ is not dict or _META_ATTR in obj:
+                results.append(self.load(obj, cls=cls, strict=strict, **kwargs))
+                continue
+
+            try:
+                result = deserializer(obj, cls, **kwargs_)
+                jsons.validate(result, cls, self._fork_inst)
+            except Exception:
+                # load raises the same error as it would have without batching
+                result = self.load(obj, cls=cls, strict=strict, **kwargs)
+
+            results.append(result)
+
+        return results
+
+    def dump_many(
+        self,
+        objs: typing.Iterable[object],
+        workers: int = 1,
+        chunk_size: int = 10000,
+        strict: bool = False,
+        **kwargs,
+    ) -> list:
+        """Dump objects, same result as dump on each of them
+
+        The serializers are looked up once per class and the caches of jsons
+        are kept for the whole batch. With workers > 1 the objects are dumped
+        chunk_size at a time by a process pool, the formatter has to use the
+        default StateHolder.
+        """
+
+        self._check_workers(workers)
+        objs = list(objs)
+
+        if workers > 1 and len(objs) > chunk_size:
+            return _map_chunks(
+                function=functools.partial(
+                    _dump_chunk,
+                    self,
+                    kwargs={**kwargs, "strict": strict},
+                ),
+                objs=objs,
+                workers=workers,
+                chunk_size=chunk_size,
+            )
+
+        serializers: dict[type, typing.Callable] = {}
+        # the arguments jsons.dump passes to the serializer
+        kwargs_ = {
+            "fork_inst": self._fork_inst,
+            "_initial": False,
+            "strict": strict,
+            **kwargs,
+        }
+        results: list = []
+        # the last object is dumped by dump, which clears the caches of jsons
+        last: int = len(objs) - 1
+
+        for i, obj in enumerate(objs):
+            cls = obj.__class__
+
+            if i == last:
+                results.append(self.dump(obj, strict=strict, **kwargs))
+                continue
+
+            if cls not in serializers:
+                jsons.announce_class(cls, fork_inst=self._fork_inst)
+                serializers[cls] = jsons.get_serializer(cls, self._fork_inst)
+
+            try:
+                result = serializers[cls](obj, cls=None, **kwargs_)
+            except Exception:
+                # dump raises the same error as it would have without batching
+                result = self.dump(obj, strict=strict, **kwargs)
+
+            results.append(result)
+
+        return results
+
+    def load_lazy(self, obj: object, cls: typing.Type[T], **kwargs) -> T:
+        """Load a dict into a LazyObject if cls is a dataclass, see load"""
+
+        if obj.__class__ is not dict or _lazy_class(cls) is not cls:
+            return self.load(obj, cls=cls, **kwargs)
+
+        return typing.cast(T, LazyObject(obj, cls, self, kwargs))
+
+    def loads_lazy(self, obj: str, cls: typing.Type[T], **kwargs) -> T:
+        return self.load_lazy(self._convert_str_to_obj(data=obj), cls=cls, **kwargs)
+
+    def loadb_lazy(
+        self,
+        obj: typing.Union[bytes, bytearray, memoryview],
+        cls: typing.Type[T],
+        **kwargs,
+    ) -> T:
+        """Parse a buffer and load it lazily, buffers are not copied where
+        the parser supports it (e.g. orjson, msgpack)
+        """
+
+        return self.load_lazy(self._convert_bytes_to_obj(obj), cls=cls, **kwargs)
+
+    def _convert_bytes_to_obj(
+        self,
+        data: typing.Union[bytes, bytearray, memoryview],
+    ) -> object:
+        return self._convert_str_to_obj(data=str(data, encoding="utf-8"))
+
     def dumps(self, obj: T, **kwargs) -> str:
         return self._convert_obj_to_str(self.dump(obj, **kwargs))
 
@@ -119,11 +906,123 @@ class Formatter(metaclass=abc.ABCMeta):
     ) -> T:
         return self.loads(obj.decode(encoding=encoding), cls=cls, **kwargs)
 
-    def write(self, path: Path, obj: object, **kwargs) -> None:
-        path.write_text(self.dumps(obj, **kwargs))
+    def write(
+        self,
+        path: Path,
+        obj: object,
+        atomic: bool = False,
+        durability: Durability = Durability.NONE,
+        **kwargs,
+    ) -> None:
+        write_bytes(
+            path=path,
+            data=self.dumpb(obj, **kwargs),
+            atomic=atomic,
+            durability=durability,
+        )
+
+    def read(
+        self,
+        path: Path,
+        cls: typing.Type[T],
+        encoding: str = "utf-8",
+        **kwargs,
+    ) -> T:
+        return self.loads(path.read_text(encoding=encoding), cls=cls, **kwargs)
+
+    def _iter_objects(self, file: typing.TextIO) -> typing.Iterator[object]:
+        """Parse the elements of a document, formats which can parse
+        incrementally override this, the whole document is parsed by default
+        """
+
+        data = self._convert_str_to_obj(file.read())
+
+        if isinstance(data, list):
+            yield from data
+        else:
+            yield data
+
+    def iter_load(
+        self,
+        file: typing.IO,
+        cls: typing.Type[T],
+        encoding: str = "utf-8",
+        **kwargs,
+    ) -> typing.Iterator[T]:
+        """Load the elements of a document one at a time
+
+        The elements of a top level array or the documents of a stream (where
+        the format supports it), anything else is a single element. Works with
+        the file objects of File.open (compressed ones as well), binary files
+        are decoded with encoding, binary formats read binary files.
+        """
+
+        with _line_reader(file, encoding, text=True) as reader:
+            for obj in self._iter_objects(reader):
+                yield self.load(obj, cls=cls, **kwargs)
+
+    def iter_read(
+        self,
+        path: Path,
+        cls: typing.Type[T],
+        encoding: str = "utf-8",
+        **kwargs,
+    ) -> typing.Iterator[T]:
+        with open(path, encoding=encoding) as file:
+            yield from self.iter_load(file, cls=cls, **kwargs)
+
+
+class BinaryFormatter(Formatter, metaclass=abc.ABCMeta):
+    """Formatter of a binary format, dumpb and loadb work on bytes directly"""
+
+    @abc.abstractmethod
+    def _convert_obj_to_bytes(self, data: object) -> bytes:
+        pass
+
+    @abc.abstractmethod
+    def _convert_bytes_to_obj(self, data: bytes) -> object:
+        pass
+
+    def _convert_obj_to_str(self, data: object) -> str:
+        raise TypeError(f"{type(self).__name__} is binary, use dumpb instead")
+
+    def _convert_str_to_obj(self, data: str) -> object:
+        raise TypeError(f"{type(self).__name__} is binary, use loadb instead")
+
+    def dumpb(self, obj: T, **kwargs) -> bytes:
+        return self._convert_obj_to_bytes(self.dump(obj, **kwargs))
+
+    def loadb(self, obj: bytes, cls: typing.Type[T], **kwargs) -> T:
+        return self.load(self._convert_bytes_to_obj(obj), cls=cls, **kwargs)
 
     def read(self, path: Path, cls: typing.Type[T], **kwargs) -> T:
-        return self.loads(path.read_text(), cls=cls, **kwargs)
+        return self.loadb(path.read_bytes(), cls=cls, **kwargs)
+
+    def _iter_objects(self, file: typing.BinaryIO) -> typing.Iterator[object]:
+        data = self._convert_bytes_to_obj(file.read())
+
+        if isinstance(data, list):
+            yield from data
+        else:
+            yield data
+
+    def iter_load(
+        self,
+        file: typing.BinaryIO,
+        cls: typing.Type[T],
+        **kwargs,
+    ) -> typing.Iterator[T]:
+        for obj in self._iter_objects(file):
+            yield self.load(obj, cls=cls, **kwargs)
+
+    def iter_read(
+        self,
+        path: Path,
+        cls: typing.Type[T],
+        **kwargs,
+    ) -> typing.Iterator[T]:
+        with open(path, "rb") as file:
+            yield from self.iter_load(file, cls=cls, **kwargs)
 
 
 class DataFormatter(typing.Generic[D], metaclass=abc.ABCMeta):
@@ -134,3 +1033,9 @@ class DataFormatter(typing.Generic[D], metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def dump_data(self, data: D) -> str:
         raise NotImplementedError
+
+    def loadb_data(self, data: bytes, encoding: str = "utf-8") -> D:
+        return self.load_data(data.decode(encoding=encoding))
+
+    def dumpb_data(self, data: D, encoding: str = "utf-8") -> bytes:
+        return self.dump_data(data).encode(encoding=encoding)
@@ -1,19 +1,135 @@
 # coding=utf-8
+import codecs
 import csv
 import dataclasses
+import datetime
 import enum
+import functools
 import io
+import itertools
+import json
+import re
+import threading
 import typing
 
-import jsons
 from ruamel.yaml import YAML
 
 try:
-    import ujson as json
+    import yaml as pyyaml
 except ImportError:
-    import json
+    pyyaml = None
 
-from .core import DataFormatter, Formatter, Parameters, StateHolder
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+from .core import (
+    BinaryFormatter,
+    DataFormatter,
+    Formatter,
+    Parameters,
+    StateHolder,
+    T,
+    _line_reader,
+)
+from .json_backend import JsonBackend, default, get_backend
+
+
+def _is_utf8(encoding: str) -> bool:
+    # the JSON backends produce and accept UTF-8 encoded bytes
+    return codecs.lookup(encoding).name == "utf-8"
+
+
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_JSON_DELIMITER = re.compile(r"[ \t\n\r]*[,\]]")
+
+
+def _iter_json_array(
+    file: typing.TextIO,
+    chunk_size: int,
+) -> typing.Iterator[object]:
+    """Parse the elements of a top level JSON array one at a time
+
+    The file is read in chunks, the buffer holds at most a chunk and the
+    element being parsed. Anything but an array is parsed as a whole.
+    """
+
+    # the backends have no incremental API, the elements are parsed by the
+    # decoder of the standard library
+    decoder = json.JSONDecoder()
+    buffer: str = ""
+    position: int = 0
+    eof: bool = False
+    # what is expected next: "[", the first element or "]", an element,
+    # "," or "]", nothing but whitespace
+    state: str = "start"
+
+    while True:
+        position = _JSON_WHITESPACE.match(buffer, position).end()
+        end: typing.Optional[int] = None
+
+        if position == len(buffer):
+            if eof:
+                if state == "end":
+                    return
+
+                raise json.JSONDecodeError(
+                    "Expecting value" if state == "start" else "Unterminated array",
+                    buffer,
+                    position,
+                )
+        elif state == "start":
+            if buffer[position] != "[":
+                yield decoder.decode(buffer[position:] + file.read())
+                return
+
+            state = "first"
+            position += 1
+            continue
+        elif state == "first" and buffer[position] == "]" or state == "delimiter":
+            if buffer[position] == ",":
+                state = "element"
+            elif buffer[position] == "]":
+                state = "end"
+            else:
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+
+            position += 1
+            continue
+        elif state == "end":
+            raise json.JSONDecodeError("Extra data", buffer, position)
+        else:
+            try:
+                obj, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+
+            # an element is complete if it is followed by a delimiter, a
+            # number may continue in the next chunk
+            if end is not None and not _JSON_DELIMITER.match(buffer, end):
+                if eof:
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, end)
+
+                end = None
+
+        if end is None:
+            # at least double the buffer, parsing a large element is retried
+            chunk: str = file.read(max(chunk_size, len(buffer) - position))
+            buffer = buffer[position:] + chunk
+            position = 0
+            eof = not chunk
+            continue
+
+        yield obj
+        position = end
+        state = "delimiter"
 
 
 @dataclasses.dataclass(frozen=True, kw_only=True)
@@ -33,36 +149,50 @@ class JsonFormatter(Formatter):
         self,
         parameters: JsonParameters = JsonParameters(),
         fork_inst: typing.Type[StateHolder] = StateHolder,
+        backend: typing.Optional[JsonBackend] = None,
     ) -> None:
         super().__init__(fork_inst)
 
         self._parameters: JsonParameters = parameters
+        self._backend: JsonBackend = backend or get_backend()
+        self._kwargs: dict[str, typing.Any] = parameters.as_dict()
 
     def _convert_obj_to_str(self, data: object) -> str:
-        return json.dumps(
-            data,
-            **typing.cast(
-                dict,
-                jsons.dump(
-                    self._parameters,
-                    cls=JsonParameters,
-                    strip_nulls=True,
-                ),
-            ),
-        )
+        return self._backend.dumps(data, **self._kwargs)
 
     def _convert_str_to_obj(self, data: str) -> object:
-        return json.loads(
-            data,
-            **typing.cast(
-                dict,
-                jsons.dump(
-                    self._parameters,
-                    cls=JsonParameters,
-                    strip_nulls=True,
-                ),
-            ),
-        )
+        return self._backend.loads(data)
+
+    def dumpb(self, obj: T, encoding: str = "utf-8", **kwargs) -> bytes:
+        if not _is_utf8(encoding):
+            return super().dumpb(obj, encoding=encoding, **kwargs)
+
+        return self._backend.dumpb(self.dump(obj, **kwargs), **self._kwargs)
+
+    def loadb(
+        self,
+        obj: bytes,
+        cls: typing.Type[T],
+        encoding: str = "utf-8",
+        **kwargs,
+    ) -> T:
+        if not _is_utf8(encoding):
+            return super().loadb(obj, cls=cls, encoding=encoding, **kwargs)
+
+        return self.load(self._backend.loads(obj), cls=cls, **kwargs)
+
+    def _convert_bytes_to_obj(
+        self,
+        data: typing.Union[bytes, bytearray, memoryview],
+    ) -> object:
+        return self._backend.loads(data)
+
+    def _iter_objects(
+        self,
+        file: typing.TextIO,
+        chunk_size: int = io.DEFAULT_BUFFER_SIZE * 8,
+    ) -> typing.Iterator[object]:
+        return _iter_json_array(file, chunk_size=chunk_size)
 
 
 @dataclasses.dataclass(frozen=True, kw_only=True)
@@ -73,30 +203,96 @@ class YamlParameters(Parameters):
 
 
 class YamlFormatter(Formatter):
+    """YAML with ruamel.yaml, the YAML instances are reused per thread
+
+    With fast set, the libyaml based C loader and dumper of PyYAML are used
+    if available. They are several times faster, but the dumped documents
+    are indented by mapping only (sequence and offset are not supported) and
+    documents are parsed as YAML 1.1 (e.g. unquoted on/off/yes/no are
+    booleans) instead of 1.2.
+    """
+
     def __init__(
         self,
         parameters: YamlParameters = YamlParameters(),
         fork_inst: typing.Type[StateHolder] = StateHolder,
+        fast: bool = False,
     ) -> None:
         super().__init__(fork_inst)
 
         self._parameters: YamlParameters = parameters
+        self._fast: bool = (
+            fast and pyyaml is not None and pyyaml.__with_libyaml__
+        )
+        self._local: threading.local = threading.local()
+
+    def __getstate__(self) -> dict:
+        state: dict = super().__getstate__()
+        del state["_local"]
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+
+        self._local = threading.local()
+
+    @property
+    def fast(self) -> bool:
+        """Whether the C loader and dumper are used"""
+        return self._fast
+
+    def _get_dumper(self) -> YAML:
+        # YAML instances are not thread-safe
+        if not hasattr(self._local, "dumper"):
+            yaml = YAML()
+            yaml.indent(
+                mapping=self._parameters.mapping,
+                sequence=self._parameters.sequence,
+                offset=self._parameters.offset,
+            )
+
+            self._local.dumper = yaml
+
+        return self._local.dumper
+
+    def _get_loader(self) -> YAML:
+        if not hasattr(self._local, "loader"):
+            self._local.loader = YAML(typ="safe")
+
+        return self._local.loader
 
     def _convert_obj_to_str(self, data: object) -> str:
+        if self._fast:
+            return pyyaml.dump(
+                data,
+                Dumper=pyyaml.CSafeDumper,
+                indent=self._parameters.mapping,
+                default_flow_style=False,
+                allow_unicode=True,
+                sort_keys=False,
+            )
+
         yaml_container = io.StringIO()
 
-        yaml = YAML()
-        yaml.indent(
-            mapping=self._parameters.mapping,
-            sequence=self._parameters.sequence,
-            offset=self._parameters.offset,
-        )
-        yaml.dump(data=data, stream=yaml_container)
+        self._get_dumper().dump(data=data, stream=yaml_container)
 
         return yaml_container.getvalue()
 
     def _convert_str_to_obj(self, data: str) -> object:
-        return YAML(typ="safe").load(data)
+        if self._fast:
+            return pyyaml.load(data, Loader=pyyaml.CSafeLoader)
+
+        return self._get_loader().load(data)
+
+    def _iter_objects(self, file: typing.TextIO) -> typing.Iterator[object]:
+        # documents are parsed one at a time from the stream, the parser keeps
+        # its state while the generator is paused, the loader of the thread
+        # can not be shared with it
+        if self._fast:
+            return pyyaml.load_all(file, Loader=pyyaml.CSafeLoader)
+
+        return YAML(typ="safe").load_all(file)
 
 
 @dataclasses.dataclass(frozen=True, kw_only=True)
@@ -145,6 +341,83 @@ class EnvFormatter(Formatter):
         return d
 
 
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class MsgpackParameters(Parameters):
+    use_single_float: typing.Optional[bool] = None
+    use_bin_type: typing.Optional[bool] = None
+
+
+class MsgpackFormatter(BinaryFormatter):
+    """MessagePack, requires the optional msgpack package"""
+
+    def __init__(
+        self,
+        parameters: MsgpackParameters = MsgpackParameters(),
+        fork_inst: typing.Type[StateHolder] = StateHolder,
+    ) -> None:
+        if msgpack is None:
+            raise ImportError("MsgpackFormatter requires the msgpack package")
+
+        super().__init__(fork_inst)
+
+        self._parameters: MsgpackParameters = parameters
+        self._kwargs: dict[str, typing.Any] = parameters.as_dict()
+
+    def _convert_obj_to_bytes(self, data: object) -> bytes:
+        return msgpack.packb(data, default=default, **self._kwargs)
+
+    def _convert_bytes_to_obj(self, data: bytes) -> object:
+        # maps with int keys (packed from dicts) are valid, as with packb
+        return msgpack.unpackb(data, strict_map_key=False)
+
+    def _iter_objects(self, file: typing.BinaryIO) -> typing.Iterator[object]:
+        # the elements of a top level array are unpacked one at a time, as
+        # well as a stream of concatenated objects
+        unpacker = msgpack.Unpacker(file, strict_map_key=False)
+
+        try:
+            size: int = unpacker.read_array_header()
+        except ValueError:
+            pass
+        except msgpack.OutOfData:
+            return
+        else:
+            for _ in range(size):
+                yield unpacker.unpack()
+
+        yield from unpacker
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class CborParameters(Parameters):
+    canonical: typing.Optional[bool] = None
+    datetime_as_timestamp: typing.Optional[bool] = None
+    value_sharing: typing.Optional[bool] = None
+
+
+class CborFormatter(BinaryFormatter):
+    """CBOR, requires the optional cbor2 package"""
+
+    def __init__(
+        self,
+        parameters: CborParameters = CborParameters(),
+        fork_inst: typing.Type[StateHolder] = StateHolder,
+    ) -> None:
+        if cbor2 is None:
+            raise ImportError("CborFormatter requires the cbor2 package")
+
+        super().__init__(fork_inst)
+
+        self._parameters: CborParameters = parameters
+        self._kwargs: dict[str, typing.Any] = parameters.as_dict()
+
+    def _convert_obj_to_bytes(self, data: object) -> bytes:
+        return cbor2.dumps(data, **self._kwargs)
+
+    def _convert_bytes_to_obj(self, data: bytes) -> object:
+        return cbor2.loads(data)
+
+
 class XSVParametersQuoting(enum.IntEnum):
     QUOTE_ALL = csv.QUOTE_ALL
     QUOTE_MINIMAL = csv.QUOTE_MINIMAL
@@ -163,10 +436,181 @@ class XSVParameters(Parameters):
     skipinitialspace: typing.Optional[bool] = None
 
 
+class XSVColumnType(enum.Enum):
+    STR = "str"
+    INT = "int"
+    FLOAT = "float"
+    DATE = "date"
+    DATETIME = "datetime"
+
+
+_xsv_decoders: dict[XSVColumnType, typing.Callable[[str], typing.Any]] = {
+    XSVColumnType.STR: str,
+    XSVColumnType.INT: int,
+    XSVColumnType.FLOAT: float,
+    XSVColumnType.DATE: datetime.date.fromisoformat,
+    XSVColumnType.DATETIME: datetime.datetime.fromisoformat,
+}
+
+_xsv_dtypes: dict[XSVColumnType, str] = {
+    XSVColumnType.STR: "object",
+    XSVColumnType.INT: "int64",
+    XSVColumnType.FLOAT: "float64",
+    XSVColumnType.DATE: "datetime64[D]",
+    XSVColumnType.DATETIME: "datetime64[us]",
+}
+
+XSVSchema = typing.Sequence[XSVColumnType]
+
+
+def _decode_column(
+    column: typing.Sequence[str],
+    column_type: XSVColumnType,
+) -> list[typing.Any]:
+    """Decode the values of a column, empty values become None"""
+
+    if column_type is XSVColumnType.STR:
+        return list(column)
+
+    decoder = _xsv_decoders[column_type]
+
+    try:
+        return list(map(decoder, column))
+    except ValueError:
+        return [decoder(value) if value != "" else None for value in column]
+
+
 class XSVDataFormatter(DataFormatter[typing.Iterable[typing.Iterable[typing.Any]]]):
     def __init__(self, parameters: typing.Optional[XSVParameters] = None) -> None:
         self._parameters: XSVParameters = parameters or XSVParameters()
 
+    def _iter_batches(
+        self,
+        file: typing.IO,
+        schema: typing.Optional[XSVSchema],
+        header: bool,
+        batch_size: int,
+        encoding: str,
+    ) -> typing.Iterator[tuple[typing.Optional[list[str]], list[list[typing.Any]]]]:
+        """Read (header, columns) batch_size rows at a time"""
+
+        with _line_reader(file, encoding, text=True, newline="") as lines:
+            reader = csv.reader(lines, **self._parameters.as_dict())
+            names: typing.Optional[list[str]] = next(reader, None) if header else None
+
+            while True:
+                batch: list[list[str]] = [
+                    row for row in itertools.islice(reader, batch_size) if row
+                ]
+
+                if not batch:
+                    return
+
+                width: int = len(batch[0])
+
+                if any(len(row) != width for row in batch):
+                    raise ValueError("Rows of different lengths can not be decoded")
+
+                columns: list[typing.Sequence[str]] = list(zip(*batch))
+
+                if schema is not None:
+                    if len(schema) != width:
+                        raise ValueError(
+                            f"Schema has {len(schema)} columns, rows have {width}"
+                        )
+
+                    columns = [
+                        _decode_column(column, column_type)
+                        for column, column_type in zip(columns, schema)
+                    ]
+
+                yield names, columns
+
+    def iter_rows(
+        self,
+        file: typing.IO,
+        schema: typing.Optional[XSVSchema] = None,
+        header: bool = False,
+        batch_size: int = 1000,
+        encoding: str = "utf-8",
+    ) -> typing.Iterator[list[typing.Any]]:
+        """Read the rows of a text or binary file object one at a time
+
+        Works with the file objects of File.open (compressed ones as well).
+        The columns are decoded by the schema batch_size rows at a time, empty
+        values of non-str columns become None. The header is skipped if set.
+        """
+
+        if schema is None:
+            with _line_reader(file, encoding, text=True, newline="") as lines:
+                reader = csv.reader(lines, **self._parameters.as_dict())
+
+                if header:
+                    next(reader, None)
+
+                yield from (row for row in reader if row)
+
+            return
+
+        for _, columns in self._iter_batches(
+            file, schema, header, batch_size, encoding
+        ):
+            yield from map(list, zip(*columns))
+
+    def load_columns(
+        self,
+        file: typing.IO,
+        schema: typing.Optional[XSVSchema] = None,
+        header: bool = False,
+        as_numpy: bool = False,
+        batch_size: int = 10000,
+        encoding: str = "utf-8",
+    ) -> dict[typing.Union[str, int], typing.Union[list[typing.Any], typing.Any]]:
+        """Read a text or binary file object into columns
+
+        The columns are keyed by the header if set, by index otherwise. With
+        as_numpy the columns are NumPy arrays of the type of the schema,
+        columns with empty values are object arrays.
+        """
+
+        if as_numpy:
+            # imported on use, importing numpy is slow
+            try:
+                import numpy
+            except ImportError:
+                raise ImportError("as_numpy requires the numpy package")
+
+        names: typing.Optional[list[str]] = None
+        columns: list[list[typing.Any]] = []
+
+        for names, batch in self._iter_batches(
+            file, schema, header, batch_size, encoding
+        ):
+            if not columns:
+                columns = [[] for _ in batch]
+            elif len(batch) != len(columns):
+                raise ValueError("Rows of different lengths can not be decoded")
+
+            for column, values in zip(columns, batch):
+                column.extend(values)
+
+        if as_numpy:
+            columns = [
+                numpy.array(
+                    column,
+                    dtype=(
+                        _xsv_dtypes[schema[i]]
+                        if schema is not None and None not in column
+                        else object
+                    ),
+                )
+                for i, column in enumerate(columns)
+            ]
+
+        keys: typing.Sequence[typing.Union[str, int]] = names or range(len(columns))
+
+        return dict(zip(keys, columns))
+
     def load_data(self, data: str) -> typing.Iterable[typing.Iterable[typing.Any]]:
         rows: list[str] = data.split(self._parameters.lineterminator or '\n')
         reader = csv.reader(rows, **self._parameters.as_dict())
@@ -183,13 +627,108 @@ class XSVDataFormatter(DataFormatter[typing.Iterable[typing.Iterable[typing.Any]
 
 
 class JsonDataFormatter(DataFormatter[typing.Iterable[dict[str, typing.Any]]]):
-    def __init__(self, parameters: typing.Optional[JsonParameters] = None) -> None:
+    def __init__(
+        self,
+        parameters: typing.Optional[JsonParameters] = None,
+        backend: typing.Optional[JsonBackend] = None,
+    ) -> None:
         self._parameters: JsonParameters = parameters or JsonParameters()
+        self._backend: JsonBackend = backend or get_backend()
+        self._kwargs: dict[str, typing.Any] = self._parameters.as_dict()
 
     def load_data(self, data: str) -> typing.Iterable[dict[str, typing.Any]]:
         rows: list[str] = data.split("\n")
-        return [json.loads(r) for r in rows]
+        return [self._backend.loads(r) for r in rows if r and not r.isspace()]
 
     def dump_data(self, data: typing.Iterable[dict[str, typing.Any]]) -> str:
-        rows: list[str] = [json.dumps(d, **self._parameters.as_dict()) for d in data]
+        rows: list[str] = [self._backend.dumps(d, **self._kwargs) for d in data]
         return "\n".join(rows)
+
+    def loadb_data(
+        self,
+        data: bytes,
+        encoding: str = "utf-8",
+    ) -> typing.Iterable[dict[str, typing.Any]]:
+        if not _is_utf8(encoding):
+            return super().loadb_data(data, encoding=encoding)
+
+        return [
+            self._backend.loads(r)
+            for r in data.split(b"\n")
+            if r and not r.isspace()
+        ]
+
+    def dumpb_data(
+        self,
+        data: typing.Iterable[dict[str, typing.Any]],
+        encoding: str = "utf-8",
+    ) -> bytes:
+        if not _is_utf8(encoding):
+            return super().dumpb_data(data, encoding=encoding)
+
+        return b"\n".join(self._backend.dumpb(d, **self._kwargs) for d in data)
+
+    def iter_load(
+        self,
+        file: typing.IO,
+        encoding: str = "utf-8",
+    ) -> typing.Iterator[dict[str, typing.Any]]:
+        """Load the records of a text or binary file object one at a time
+
+        Works with the file objects of File.open (compressed ones as well),
+        empty lines are skipped.
+        """
+
+        with _line_reader(file, encoding, text=not _is_utf8(encoding)) as lines:
+            for line in lines:
+                if line and not line.isspace():
+                    yield self._backend.loads(line)
+
+    def dump_to(
+        self,
+        file: typing.IO,
+        data: typing.Iterable[dict[str, typing.Any]],
+        encoding: str = "utf-8",
+        batch_size: int = 1000,
+    ) -> int:
+        """Write the records to a text or binary file object, one per line
+
+        Records are serialized and written batch_size at a time, data can be
+        a generator of any length. Returns the number of records written.
+        """
+
+        empty: typing.Union[str, bytes] = b""
+
+        if isinstance(file, io.TextIOBase):
+            dump: typing.Callable[[typing.Any], typing.Any] = self._dump_line
+            empty = ""
+        elif _is_utf8(encoding):
+            dump = self._dumpb_line
+        else:
+            dump = functools.partial(self._dumpb_line_encoded, encoding=encoding)
+
+        count: int = 0
+        batch: list = []
+
+        for record in data:
+            batch.append(dump(record))
+
+            if len(batch) >= batch_size:
+                file.write(empty.join(batch))
+                count += len(batch)
+                batch.clear()
+
+        if batch:
+            file.write(empty.join(batch))
+            count += len(batch)
+
+        return count
+
+    def _dump_line(self, record: dict[str, typing.Any]) -> str:
+        return self._backend.dumps(record, **self._kwargs) + "\n"
+
+    def _dumpb_line(self, record: dict[str, typing.Any]) -> bytes:
+        return self._backend.dumpb(record, **self._kwargs) + b"\n"
+
+    def _dumpb_line_encoded(self, record: dict[str, typing.Any], encoding: str) -> bytes:
+        return self._dump_line(record).encode(encoding=encoding)
@@ -0,0 +1,223 @@
+# coding=utf-8
+from __future__ import annotations
+
+import abc
+import dataclasses
+import datetime
+import enum
+import json
+import uuid
+from typing import Any, Optional, Type, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+_backends: dict[str, Type[JsonBackend]] = {}
+
+
+def default(obj: Any) -> Any:
+    """Convert the types the JSON libraries do not handle natively"""
+
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+
+    raise TypeError(
+        f"Object of type {type(obj).__name__} is not JSON serializable"
+    )
+
+
+def create_backend(name: str) -> Type[JsonBackend]:
+    return _backends[name]
+
+
+def get_backend(name: Optional[str] = None) -> JsonBackend:
+    """Create the named backend, ujson or the standard library if not given
+
+    orjson is only used if asked for by name, its output differs from
+    json.dumps (see OrjsonBackend).
+    """
+
+    if name is not None:
+        return create_backend(name=name)()
+
+    for name in ("ujson", "json"):
+        try:
+            return create_backend(name=name)()
+        except ImportError:
+            continue
+
+    raise ImportError("No JSON backend available")
+
+
+class JsonBackend(metaclass=abc.ABCMeta):
+    def __init__(self, name: str) -> None:
+        self._name: str = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @abc.abstractmethod
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        raise NotImplementedError()
+
+    def dumpb(self, obj: Any, **kwargs: Any) -> bytes:
+        return self.dumps(obj, **kwargs).encode("utf-8")
+
+    @abc.abstractmethod
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        raise NotImplementedError()
+
+
+class StdlibJsonBackend(JsonBackend):
+    def __init__(self) -> None:
+        super().__init__("json")
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        kwargs.setdefault("default", default)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+
+        return json.loads(data)
+
+
+_backends["json"] = StdlibJsonBackend
+
+
+class UjsonBackend(JsonBackend):
+    # keyword arguments of json.dumps understood by ujson
+    _supported: frozenset[str] = frozenset(
+        {"ensure_ascii", "indent", "sort_keys", "default"}
+    )
+
+    def __init__(self) -> None:
+        if ujson is None:
+            raise ImportError("UjsonBackend requires the ujson package")
+
+        super().__init__("ujson")
+
+        self._fallback: JsonBackend = StdlibJsonBackend()
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if not self._supported.issuperset(kwargs):
+            return self._fallback.dumps(obj, **kwargs)
+
+        kwargs.setdefault("default", default)
+        return ujson.dumps(obj, **kwargs)
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+
+        return ujson.loads(data)
+
+
+_backends["ujson"] = UjsonBackend
+
+
+class OrjsonBackend(JsonBackend):
+    """orjson, produces bytes natively
+
+    Handles datetime, UUID and dataclasses natively. Options orjson has no
+    equivalent for (e.g. ensure_ascii, allow_nan, indent other than 2,
+    separators) and integers beyond 64 bit fall back to the standard library,
+    so do documents orjson can not parse (NaN, Infinity). Unlike json.dumps,
+    non-ascii characters are not escaped and NaN and Infinity are written as
+    null.
+    """
+
+    # keyword arguments of json.dumps which can be mapped to orjson options
+    _supported: frozenset[str] = frozenset(
+        {
+            "ensure_ascii",
+            "indent",
+            "sort_keys",
+            "default",
+            "check_circular",
+        }
+    )
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("OrjsonBackend requires the orjson package")
+
+        super().__init__("orjson")
+
+        self._fallback: JsonBackend = StdlibJsonBackend()
+
+    @classmethod
+    def _option(cls, kwargs: dict[str, Any]) -> Optional[int]:
+        """Map json.dumps keyword arguments to orjson options if possible"""
+
+        if (
+            not cls._supported.issuperset(kwargs) or
+            kwargs.get("indent") not in (None, 2) or
+            # orjson never escapes non-ascii characters
+            kwargs.get("ensure_ascii")
+        ):
+            return None
+
+        option: int = 0
+
+        if kwargs.get("sort_keys"):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent") == 2:
+            option |= orjson.OPT_INDENT_2
+
+        return option
+
+    def dumpb(self, obj: Any, **kwargs: Any) -> bytes:
+        option: Optional[int] = self._option(kwargs)
+
+        if option is None:
+            return self._fallback.dumpb(obj, **kwargs)
+
+        try:
+            return orjson.dumps(
+                obj,
+                default=kwargs.get("default") or default,
+                option=option,
+            )
+        except orjson.JSONEncodeError:
+            pass
+
+        try:
+            # json.dumps accepts int, float, bool and None keys, the option
+            # slows down every call and is only set if needed
+            return orjson.dumps(
+                obj,
+                default=kwargs.get("default") or default,
+                option=option | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers exceeding 64 bit
+            return self._fallback.dumpb(obj, **kwargs)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumpb(obj, **kwargs).decode("utf-8")
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN and Infinity, really invalid documents fail here again
+            return self._fallback.loads(data)
+
+
+_backends["orjson"] = OrjsonBackend